@@ -7,7 +7,7 @@ from dotenv import load_dotenv
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.openapi.utils import get_openapi
 from pathlib import Path
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -64,6 +64,12 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("🛑 FastAPI TBA-App shutting down")
+    try:
+        from routes.chat import close_combat_log, close_message_writer
+        await close_message_writer()
+        await close_combat_log()
+    except Exception as e:
+        logger.warning(f"⚠️ Chat queue flush failed: {e}")
 
 
 # Create FastAPI app
@@ -72,6 +78,8 @@ application = FastAPI(
     description="TTRPG system API server with real-time multiplayer support",
     version="1.0.0",
     lifespan=lifespan,
+    # Route return values are encoded with orjson rather than the stdlib json module
+    default_response_class=ORJSONResponse,
 )
 
 # Add rate limiter to app state
@@ -94,7 +102,7 @@ application.add_middleware(
 async def health_check():
     """Minimal health check for Railway — no auth required."""
     logger.info("🏥 Health check hit")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={"status": "ok", "service": "TBA-App"},
     )
@@ -155,7 +163,7 @@ async def attach_request_id_and_auth(request: Request, call_next):
         provided_key = request.headers.get("X-API-Key")
         if not provided_key or provided_key != API_KEY:
             logger.warning(f"[{request_id}] Unauthorized: {request.method} {request.url.path}")
-            return JSONResponse(status_code=403, content={"error": "Invalid X-API-Key"})
+            return ORJSONResponse(status_code=403, content={"error": "Invalid X-API-Key"})
 
     response = await call_next(request)
     response.headers["X-Request-ID"] = request_id
@@ -359,14 +367,6 @@ async def create_character_form():
         return HTMLResponse("<h1>Error</h1><p>Character creation form not found.</p>", status_code=404)
 
 
-@application.get("/ws-test")
-async def ws_test():
-    ws_test_path = Path("static/ws-test.html")
-    if ws_test_path.exists():
-        return HTMLResponse(ws_test_path.read_text())
-    return HTMLResponse("<h1>Error</h1><p>WebSocket test page not found.</p>", status_code=404)
-
-
 @application.get("/join/{code}")
 async def direct_join_campaign(code: str):
     """
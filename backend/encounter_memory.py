@@ -1,4 +1,5 @@
 # backend/encounter_memory.py
+from collections import defaultdict
 from typing import Optional
 
 encounter_state = {
@@ -7,7 +8,11 @@ encounter_state = {
     "location": None,
     "initiative_order": [],
     "encounter_id": None,
-    "effects": []
+    "effects": [],
+    # Same effect dicts as "effects", grouped by actor name for per-actor lookups
+    "effects_by_actor": defaultdict(list),
+    # ...and by the round they were applied in, for per-round resolution
+    "effects_by_round": defaultdict(list)
 }
 
 def add_actor(actor: dict):
@@ -37,25 +42,73 @@ def get_encounter_id():
     return encounter_state["encounter_id"]
 
 def add_effect(effect: dict):
-    if "effects" not in encounter_state:
-        encounter_state["effects"] = []
     encounter_state["effects"].append(effect)
+    encounter_state["effects_by_actor"][effect["actor"]].append(effect)
+    encounter_state["effects_by_round"][effect.get("round")].append(effect)
     return effect
 
 def get_effects():
     return encounter_state["effects"]
 
+def get_effects_for_actor(actor_name: str):
+    return encounter_state["effects_by_actor"].get(actor_name, [])
+
 def clear_effects():
     encounter_state["effects"] = []
+    encounter_state["effects_by_actor"] = defaultdict(list)
+    encounter_state["effects_by_round"] = defaultdict(list)
+
+def _index_by_round(effects):
+    by_round = defaultdict(list)
+    for effect in effects:
+        by_round[effect.get("round")].append(effect)
+    encounter_state["effects_by_round"] = by_round
 
 def remove_effect(actor_name: str, tag: Optional[str] = None):
+    by_actor = encounter_state["effects_by_actor"]
+    actor_effects = by_actor.get(actor_name)
+    # Nothing on this actor (or with this tag): skip the full-list rebuild
+    if not actor_effects or (tag is not None and all(e.get("tag") != tag for e in actor_effects)):
+        return
+    kept = [e for e in actor_effects if tag is not None and e.get("tag") != tag]
+    if kept:
+        by_actor[actor_name] = kept
+    else:
+        del by_actor[actor_name]
     encounter_state["effects"] = [
         e for e in encounter_state["effects"]
         if not (e["actor"] == actor_name and (tag is None or e.get("tag") == tag))
     ]
+    _index_by_round(encounter_state["effects"])
+
+def tick_effects():
+    """Count down timed effects in one pass; drop and return the ones that ran out."""
+    effects = encounter_state["effects"]
+    if not effects:
+        return []
+    # Compact survivors to the front of the list in place rather than copying them
+    expired = []
+    expire = expired.append
+    write = 0
+    for effect in effects:
+        if effect.get("duration"):
+            effect["duration"] -= 1
+            if effect["duration"] <= 0:
+                expire(effect)
+                continue
+        effects[write] = effect
+        write += 1
+    if expired:
+        del effects[write:]
+        by_actor = defaultdict(list)
+        for effect in effects:
+            by_actor[effect["actor"]].append(effect)
+        encounter_state["effects_by_actor"] = by_actor
+        _index_by_round(effects)
+    return expired
 
 def resolve_effects(round: int):
-    return [e for e in encounter_state["effects"] if e.get("round") == round]
+    return list(encounter_state["effects_by_round"].get(round, ()))
 
 def reset_encounter():
     encounter_state["actors"] = []
@@ -64,6 +117,8 @@ def reset_encounter():
     encounter_state["initiative_order"] = []
     encounter_state["encounter_id"] = None  # ✅ Reset here
     encounter_state["effects"] = []  # ✅ Reset effects
+    encounter_state["effects_by_actor"] = defaultdict(list)
+    encounter_state["effects_by_round"] = defaultdict(list)
 
 def add_lore_entry(actor: str, round: Optional[int], tag: str, effect: str, duration: int, encounter_id: Optional[str]):
     entry = {
@@ -8,6 +8,7 @@ Integrates with mention parser, character cache, and combat turn tracker.
 import re
 import random
 import logging
+from operator import itemgetter
 from typing import Dict, Any
 from sqlalchemy.orm import Session
 
@@ -366,7 +367,7 @@ def handle_initiative_roll(
         })
 
     # Sort combatants by initiative (highest first)
-    encounter["combatants"].sort(key=lambda x: x["initiative"], reverse=True)
+    encounter["combatants"].sort(key=itemgetter("initiative"), reverse=True)
 
     # Set first turn
     if encounter["combatants"]:
@@ -378,7 +379,7 @@ def handle_initiative_roll(
     # Format broadcast
     results_str = "\n".join([
         f"**{r['name']}**: {r['roll']} = {r['initiative']}"
-        for r in sorted(results, key=lambda x: x["initiative"], reverse=True)
+        for r in sorted(results, key=itemgetter("initiative"), reverse=True)
     ])
 
     current_combatant = encounter["combatants"][0]["name"] if encounter["combatants"] else "Unknown"
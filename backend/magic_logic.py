@@ -2,20 +2,27 @@
 
 import random
 from typing import List, Dict
-from backend.encounter_memory import get_effects, remove_effect
+from backend.encounter_memory import remove_effect, resolve_effects as effects_in_round
+
+# Spell die by level threshold and slot, highest threshold first
+SPELL_TABLE = (
+    (10, ("2d8", "1d12", "2d6", "1d10", "1d12")),
+    (9, ("2d8", "1d12", "1d10", "1d10", "1d10")),
+    (7, ("1d12", "1d10", "1d8", "1d8", None)),
+    (5, ("1d10", "1d8", "1d6", None, None)),
+    (3, ("1d8", "1d6", None, None, None)),
+    (1, ("1d6", None, None, None, None)),
+)
+
+# Flat spell-roll bonus by spell die
+SPELL_DIE_BUFF = {
+    "1d6": 1, "1d8": 2, "1d10": 3, "1d12": 4, "2d6": 5, "2d8": 6
+}
 
 def get_spell_die(level, slot):
-    spell_table = {
-        1: ["1d6", None, None, None, None],
-        3: ["1d8", "1d6", None, None, None],
-        5: ["1d10", "1d8", "1d6", None, None],
-        7: ["1d12", "1d10", "1d8", "1d8", None],
-        9: ["2d8", "1d12", "1d10", "1d10", "1d10"],
-        10: ["2d8", "1d12", "2d6", "1d10", "1d12"]
-    }
-    for lvl in sorted(spell_table.keys(), reverse=True):
+    for lvl, dice in SPELL_TABLE:
         if level >= lvl:
-            return spell_table[lvl][slot]
+            return dice[slot]
     return "1d6"  # fallback
 
 def roll_die(die: str) -> int:
@@ -139,11 +146,7 @@ def resolve_spellcast(caster, target, spell, distance="medium", log=False, encou
     # Determine spell die from level and slot
     spell_die = get_spell_die(caster.level, spell.slot)  # e.g., "1d8"
 
-    buff_table = {
-    "1d6": 1, "1d8": 2, "1d10": 3, "1d12": 4, "2d6": 5, "2d8": 6
-    }
-    
-    modifier = buff_table.get(spell_die, 0)
+    modifier = SPELL_DIE_BUFF.get(spell_die, 0)
     spell_roll = roll_die(spell_die) + caster.stats["IP"] + caster.edge + modifier
     defense_roll = roll_die(target.defense_die) + target.stats["PP"] + target.edge
     bap_triggered = spell.bap_triggered
@@ -234,34 +237,33 @@ def resolve_calling(character):
 # backend/magic_logic.py
 
 def resolve_effects(round: int):
-    active = get_effects()
+    active = effects_in_round(round)
     results = []
 
     for effect in active:
-        if effect.get("round") == round:
-            actor = effect["actor"]
-            effect_type = effect["effect"]
-            duration = effect["duration"]
-
-            if effect_type == "burn":
-                dmg = roll_die("1d4")
-                results.append({
-                    "actor": actor,
-                    "effect": "burn",
-                    "damage": dmg,
-                    "note": f"{actor} takes {dmg} burn damage at start of round {round}."
-                })
-            elif effect_type == "buff":
-                results.append({
-                    "actor": actor,
-                    "effect": "buff",
-                    "note": f"{actor} gains a temporary bonus from {effect.get('tag')}."
-                })
-
-            # Decrement or remove
-            if duration <= 1:
-                remove_effect(actor, tag=effect.get("tag"))
-            else:
-                effect["duration"] -= 1
+        actor = effect["actor"]
+        effect_type = effect["effect"]
+        duration = effect["duration"]
+
+        if effect_type == "burn":
+            dmg = roll_die("1d4")
+            results.append({
+                "actor": actor,
+                "effect": "burn",
+                "damage": dmg,
+                "note": f"{actor} takes {dmg} burn damage at start of round {round}."
+            })
+        elif effect_type == "buff":
+            results.append({
+                "actor": actor,
+                "effect": "buff",
+                "note": f"{actor} gains a temporary bonus from {effect.get('tag')}."
+            })
+
+        # Decrement or remove
+        if duration <= 1:
+            remove_effect(actor, tag=effect.get("tag"))
+        else:
+            effect["duration"] -= 1
 
     return results
\ No newline at end of file
@@ -0,0 +1,4 @@
+-- Migration 020: Composite index for ability macro dispatch
+-- Chat macros resolve abilities by (character_id, macro_command) on every cast.
+
+CREATE INDEX IF NOT EXISTS idx_abilities_character_macro ON abilities(character_id, macro_command);
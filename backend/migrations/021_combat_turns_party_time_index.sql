@@ -0,0 +1,4 @@
+-- Migration 021: Composite index for combat history
+-- get_combat_history reads a party's turns newest-first with a timestamp cursor.
+
+CREATE INDEX IF NOT EXISTS idx_combat_turns_party_time ON combat_turns(party_id, timestamp DESC);
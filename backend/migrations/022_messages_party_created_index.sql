@@ -0,0 +1,4 @@
+-- Migration 022: Composite index for party message history
+-- get_party_messages pages a party's messages newest-first with a (created_at, id) cursor.
+
+CREATE INDEX IF NOT EXISTS idx_messages_party_created_id ON messages(party_id, created_at DESC, id DESC);
@@ -9,7 +9,7 @@ Phase 2d schema with:
 - Messages with party routing
 - NPCs and combat turns
 """
-from sqlalchemy import Column, String, DateTime, JSON, Integer, BigInteger, ForeignKey, Boolean, Text, Enum
+from sqlalchemy import Column, String, DateTime, JSON, Integer, BigInteger, ForeignKey, Boolean, Text, Enum, Index, desc
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -501,7 +501,11 @@ class CombatTurn(Base):
     Logs each combat action for replay, BAP tracking, and audit purposes.
     """
     __tablename__ = "combat_turns"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Newest-first history per party (get_combat_history keyset pagination)
+        Index("idx_combat_turns_party_time", "party_id", desc("timestamp")),
+        {'extend_existing': True},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     party_id = Column(UUID(as_uuid=True), ForeignKey("parties.id"), nullable=False, index=True)
@@ -597,7 +601,11 @@ class Ability(Base):
     power source (PP/IP/SP) for rolls.
     """
     __tablename__ = "abilities"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Macro dispatch looks abilities up by (character, command)
+        Index("idx_abilities_character_macro", "character_id", "macro_command"),
+        {'extend_existing': True},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     character_id = Column(UUID(as_uuid=True), ForeignKey("characters.id"), nullable=False, index=True)
@@ -635,7 +643,11 @@ class Message(Base):
     Modes: IC (in-character), OOC (out-of-character)
     """
     __tablename__ = "messages"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Newest-first history per party (get_party_messages keyset pagination on (created_at, id))
+        Index("idx_messages_party_created_id", "party_id", desc("created_at"), desc("id")),
+        {'extend_existing': True},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     campaign_id = Column(UUID(as_uuid=True), nullable=False, index=True)  # Campaign this message belongs to
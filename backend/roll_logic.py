@@ -5,9 +5,11 @@ import re
 from schemas.loader import CORE_RULESET
 from backend.utils.storage import store_roll  # Keep if exists, else comment out
 
+_DIE_RE = re.compile(r"(\d+)d(\d+)")
+
 ### 🎲 Dice Utilities ###
 def parse_die(die_str):
-    match = re.fullmatch(r"(\d+)d(\d+)", die_str)
+    match = _DIE_RE.fullmatch(die_str)
     if not match:
         raise ValueError(f"Invalid die format: {die_str}")
     return int(match.group(1)), int(match.group(2))
@@ -190,7 +192,7 @@ from schemas.loader import CORE_RULESET
 
 ### 🎲 Dice Utilities ###
 def parse_die(die_str):
-    match = re.fullmatch(r"(\d+)d(\d+)", die_str)
+    match = _DIE_RE.fullmatch(die_str)
     if not match:
         raise ValueError(f"Invalid die format: {die_str}")
     return int(match.group(1)), int(match.group(2))
@@ -350,7 +352,7 @@ def simulate_encounter_combat(attacker, defender, weapon_die, defense_die, bap):
     print("✅ simulate_combat() was called")
 
     import uuid
-    from backend.encounter_memory import set_encounter_id, resolve_effects, get_effects, remove_effect
+    from backend.encounter_memory import set_encounter_id, resolve_effects, remove_effect, tick_effects
     # from backend.lore_log import add_lore_entry
     
     encounter_id = str(uuid.uuid4())
@@ -398,11 +400,7 @@ def simulate_encounter_combat(attacker, defender, weapon_die, defense_die, bap):
                     #     "encounter_id": encounter_id
                     # })
 
-            for effect in get_effects():
-                if effect.get("duration"):
-                    effect["duration"] -= 1
-                    if effect["duration"] <= 0:
-                        remove_effect(effect["actor"], effect.get("tag"))
+            tick_effects()
 
 
             for actor_name in initiative_order:
@@ -558,14 +556,14 @@ def roll_initiative(combatants):
 
 def check_tether(actor, context):
     active_mods = []
-    for tether in actor.get("tethers", []):
+    for tether in actor.get("tethers", ()):
         if tether["condition"] in context:
             active_mods.append(tether["modifier"])
     return active_mods
 
 def trigger_echo(actor, context):
     bonuses = []
-    for echo in actor.get("echoes", []):
+    for echo in actor.get("echoes", ()):
         if echo["trigger"] in context:
             bonuses.append(echo["effect"])
     return bonuses
@@ -791,10 +789,18 @@ def resolve_multi_die_attack(
     attacker_count, attacker_sides = parse_die(attacker_die_str)
 
     # Roll each attacker die separately
-    attacker_rolls = roll_dice(attacker_die_str)
+    randint = random.randint
+    attacker_rolls = [randint(1, attacker_sides) for _ in range(attacker_count)]
 
     # Per TBA rules: defender rolls separately for each attack die
     unconscious = defender_dp is not None and defender_dp <= 0
+    if not unconscious:
+        defense_count, defense_sides = parse_die(defense_die_str)
+        defense_dice = range(defense_count)
+
+    # Flat bonuses are the same for every die, so sum them once
+    attack_mod = attacker_stat_value + edge + weapon_bonus + bap_bonus + attacker_effect_bonus
+    defense_mod = defender_stat_value + defender_edge + armor_bonus + defender_effect_bonus
 
     # Calculate individual results
     individual_rolls = []
@@ -806,12 +812,12 @@ def resolve_multi_die_attack(
         if unconscious:
             raw_defense_roll = 0
         else:
-            raw_defense_roll = roll_die(defense_die_str)
+            raw_defense_roll = sum(randint(1, defense_sides) for _ in defense_dice)
 
-        defense_total = raw_defense_roll + defender_stat_value + defender_edge + armor_bonus + defender_effect_bonus
+        defense_total = raw_defense_roll + defense_mod
 
         # Attack total = die + stat + edge + weapon bonus + BAP + active effects
-        effective_roll = atk_die_roll + attacker_stat_value + edge + weapon_bonus + bap_bonus + attacker_effect_bonus
+        effective_roll = atk_die_roll + attack_mod
 
         # Margin = attack total - defense total
         margin = effective_roll - defense_total
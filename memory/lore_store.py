@@ -1,24 +1,59 @@
 import random
+from collections import defaultdict
 from difflib import get_close_matches
 
 lore_log = []
+# Inverted indices over lore_log, appended alongside it
+lore_by_encounter = defaultdict(list)
+lore_by_tag = defaultdict(list)
+lore_by_actor = defaultdict(list)
 
 def add_lore_entry(entry):
     lore_log.append(entry)
+    lore_by_encounter[entry.get("encounter_id")].append(entry)
+    lore_by_tag[entry.get("tag")].append(entry)
+    lore_by_actor[entry.get("actor")].append(entry)
     return entry
 
+def add_lore_entries(entries):
+    entries = list(entries)
+    lore_log.extend(entries)
+    for entry in entries:
+        lore_by_encounter[entry.get("encounter_id")].append(entry)
+        lore_by_tag[entry.get("tag")].append(entry)
+        lore_by_actor[entry.get("actor")].append(entry)
+    return entries
+
+def get_lore_by_encounter_id(encounter_id):
+    return lore_by_encounter.get(encounter_id, [])
+
+def count_lore_by_encounter(encounter_id):
+    return len(lore_by_encounter.get(encounter_id, ()))
+
+def get_lore_by_tag_name(tag):
+    return lore_by_tag.get(tag, [])
+
+def get_lore_by_actor_name(actor):
+    return lore_by_actor.get(actor, [])
+
 def fuzzy_match(value, options):
     matches = get_close_matches(value, options, n=1, cutoff=0.6)
     return matches[0] if matches else None
 
 def search_lore(actor=None, location=None, moment=None, encounter_id=None, min_round=None, max_round=None, emotion=None, trigger=None):
-    results = lore_log
+    # Fuzzy filters match against the whole log, so only narrow up front without them
+    if encounter_id and not (actor or location or moment):
+        results = list(get_lore_by_encounter_id(encounter_id))
+        encounter_id = None
+    else:
+        results = lore_log
 
     if actor:
-        actor_names = [entry["actor"] for entry in results]
+        # Actor is matched first, against the whole log: use the index's distinct names
+        actor_names = [name for name in lore_by_actor if name is not None]
         matched_actor = fuzzy_match(actor, actor_names)
         if matched_actor:
-            results = [entry for entry in results if entry["actor"] == matched_actor]
+            results = list(lore_by_actor[matched_actor])
 
     if location:
         locations = [entry["location"] for entry in results]
@@ -5,6 +5,8 @@ Achievement endpoints.
 GET  /api/achievements/me          — all achievements (earned + locked) with rarity %
 POST /api/achievements/me/evaluate — re-run check_and_award for the current user
 """
+from operator import itemgetter
+
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import func
@@ -92,12 +94,12 @@ def _build_achievements_response(user_id, db: Session) -> dict:
 
     earned_list = sorted(
         [a for a in results if a["earned"]],
-        key=lambda a: a["earned_at"],
+        key=itemgetter("earned_at"),
         reverse=True,
     )
     unearned_list = sorted(
         [a for a in results if not a["earned"]],
-        key=lambda a: a["name"],
+        key=itemgetter("name"),
     )
 
     from routes.profile import _max_featured
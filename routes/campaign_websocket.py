@@ -3161,12 +3161,17 @@ def _sort_initiative_rolls(rolls, db):
     4. Tie → highest SP
     5. Tie → snacks (SW's discretion — we just keep insertion order)
     """
+    # Tie-break stats for every rolled character in one query
+    char_ids = {roll.character_id for roll in rolls if roll.character_id}
+    stats = {}
+    if char_ids:
+        stats = {
+            c.id: ((c.pp or 0), (c.ip or 0), (c.sp or 0))
+            for c in db.query(Character).filter(Character.id.in_(char_ids)).all()
+        }
+
     def sort_key(roll):
-        pp = ip = sp = 0
-        if roll.character_id:
-            c = db.query(Character).filter(Character.id == roll.character_id).first()
-            if c:
-                pp, ip, sp = (c.pp or 0), (c.ip or 0), (c.sp or 0)
+        pp, ip, sp = stats.get(roll.character_id, (0, 0, 0))
         return (-roll.roll_result, -pp, -ip, -sp)
     return sorted(rolls, key=sort_key)
 
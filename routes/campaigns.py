@@ -2,6 +2,7 @@
 Campaign Routes - Create and manage campaigns
 """
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from typing import Optional, List
@@ -474,6 +475,10 @@ async def join_campaign(
     db.add(membership)
     db.commit()
 
+    # Campaign roles changed; chat's cached Story Weaver checks may be stale
+    from routes.chat import connection_manager
+    connection_manager.invalidate_sw_checks()
+
     # Broadcast so the SW gets a real-time toast + party panel refresh
     try:
         from routes.campaign_websocket import broadcast_player_joined
@@ -521,6 +526,10 @@ async def leave_campaign(
     membership.left_at = datetime.utcnow()
     db.commit()
 
+    # Campaign roles changed; chat's cached Story Weaver checks may be stale
+    from routes.chat import connection_manager
+    connection_manager.invalidate_sw_checks()
+
     campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
 
     # Notify SW via WebSocket (if online)
@@ -1147,7 +1156,8 @@ async def list_lore(
         .order_by(LoreEntry.created_at.asc())
         .all()
     )
-    return [_lore_dict(e) for e in entries]
+    # _lore_dict already yields JSON-safe values; skip jsonable_encoder's walk
+    return ORJSONResponse([_lore_dict(e) for e in entries])
 
 
 @router.post("/{campaign_id}/lore", status_code=201)
@@ -1505,6 +1515,10 @@ async def delete_campaign(
     db.delete(campaign)
     db.commit()
 
+    # Campaign roles changed; chat's cached Story Weaver checks may be stale
+    from routes.chat import connection_manager
+    connection_manager.invalidate_sw_checks()
+
 
 # ============================================================
 # Memory Echoes
@@ -1610,13 +1624,19 @@ async def get_initiative_state(
     ).first()
 
     if not encounter:
-        return {"active": False, "rolls": [], "current_turn_index": 0}
+        return ORJSONResponse({"active": False, "rolls": [], "current_turn_index": 0})
 
     all_rolls = db.query(InitiativeRoll).filter(
         InitiativeRoll.encounter_id == encounter.id
     ).all()
     all_rolls = _sort_initiative_rolls(all_rolls, db)
 
+    # Load every rolled character once instead of querying per roll
+    char_ids = {roll.character_id for roll in all_rolls if roll.character_id}
+    chars_by_id = {}
+    if char_ids:
+        chars_by_id = {c.id: c for c in db.query(Character).filter(Character.id.in_(char_ids)).all()}
+
     is_sw = membership.role == "story_weaver"
     result = []
     for roll in all_rolls:
@@ -1634,18 +1654,19 @@ async def get_initiative_state(
             "user_id": None,
         }
         if roll.character_id:
-            char = db.query(Character).filter(Character.id == roll.character_id).first()
+            char = chars_by_id.get(roll.character_id)
             if char:
                 entry["dp"] = char.dp
                 entry["max_dp"] = char.max_dp
                 entry["user_id"] = str(char.user_id) if char.user_id else None
         result.append(entry)
 
-    return {
+    # Entries hold only JSON-safe values; skip jsonable_encoder's walk
+    return ORJSONResponse({
         "active": True,
         "rolls": result,
         "current_turn_index": encounter.current_turn_index,
-    }
+    })
 
 
 # ============================================================================
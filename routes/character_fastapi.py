@@ -322,6 +322,12 @@ async def create_character_full(
         db.commit()
         db.refresh(character)
 
+        # Drop the chat connection manager's cached member lists for the new memberships
+        from routes.chat import connection_manager
+        for joined_party_id in party_ids:
+            connection_manager.invalidate_party_members(str(joined_party_id))
+            connection_manager.invalidate_sw_checks(str(joined_party_id))
+
         logger.info(f"[{request_id}] Full character creation complete: {character.name} ({character.id})")
 
         # Broadcast to campaign so SW gets a real-time toast + party panel refresh
@@ -762,6 +768,11 @@ async def add_party_member(
     membership = PartyMembership(party_id=party_id, character_id=req.character_id)
     db.add(membership)
     db.commit()
+
+    # Drop the chat connection manager's cached member list and Story Weaver checks for this party
+    from routes.chat import connection_manager
+    connection_manager.invalidate_party_members(party_id)
+    connection_manager.invalidate_sw_checks(party_id)
     
     logger.info(f"[{request_id}] Character added to party: {req.character_id} → {party_id}")
     return {"message": "Character added to party", "party_id": party_id, "character_id": req.character_id}
@@ -807,6 +818,11 @@ async def remove_party_member(
     db.delete(membership)
     db.commit()
 
+    # Drop the chat connection manager's cached member list and Story Weaver checks for this party
+    from routes.chat import connection_manager
+    connection_manager.invalidate_party_members(party_id)
+    connection_manager.invalidate_sw_checks(party_id)
+
     logger.info(f"[{request_id}] Character removed from party: {character_id} → {party_id}")
 
 
@@ -1649,6 +1665,10 @@ async def patch_ability(
 
     db.commit()
     db.refresh(ability)
+
+    # Chat macro dispatch caches abilities per connected character
+    from routes.chat import connection_manager
+    connection_manager.invalidate_character_abilities(character_id)
     return {
         "id":            str(ability.id),
         "slot_number":   ability.slot_number,
@@ -1691,6 +1711,9 @@ async def delete_ability(
     db.delete(ability)
     db.commit()
 
+    from routes.chat import connection_manager
+    connection_manager.invalidate_character_abilities(character_id)
+
 
 @character_blp_fastapi.post("/{character_id}/abilities", status_code=200)
 async def update_character_abilities(
@@ -1757,6 +1780,10 @@ async def update_character_abilities(
             db.add(new_ability)
 
         db.commit()
+
+        from routes.chat import connection_manager
+        connection_manager.invalidate_character_abilities(character_id)
+
         logger.info(f"[{request_id}] Updated {len(abilities_data)} abilities for character {character_id}")
         return {"message": "Abilities updated successfully", "count": len(abilities_data)}
 
@@ -1889,6 +1916,13 @@ async def approve_character(
         db.add(PartyMembership(party_id=ooc_party.id, character_id=char.id))
 
     db.commit()
+
+    # Drop the chat connection manager's cached member lists for the new memberships
+    from routes.chat import connection_manager
+    for joined_party in (story_party, ooc_party):
+        if joined_party:
+            connection_manager.invalidate_party_members(str(joined_party.id))
+            connection_manager.invalidate_sw_checks(str(joined_party.id))
     logger.info(f"[{request_id}] Character '{char.name}' approved by SW {current_user.username}")
 
     # Broadcast approval to all campaign members so the player auto-reloads
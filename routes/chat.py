@@ -1,35 +1,195 @@
 from urllib import response
 from fastapi import APIRouter, Request, Form, Body, WebSocket, WebSocketDisconnect, Query
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
+from sqlalchemy import insert, literal, select, tuple_, union_all, update
+from sqlalchemy.orm import Session
 from backend.magic_logic import resolve_spellcast
+from backend.mention_parser import parse_mentions
+from backend.roll_logic import resolve_multi_die_attack
 from backend.db import SessionLocal
 from backend.models import Character, Party, NPC, PartyMembership, CombatTurn, Ability, Campaign, Message
 from routes.schemas.chat import ChatMessageSchema
 from routes.schemas.resolve import ResolveRollSchema
-from typing import Dict, Any, Optional, List
-from time import monotonic
-from datetime import datetime
-import json
+from typing import Callable, Dict, Any, Optional, List
+from collections import deque
+from time import monotonic, time
+from datetime import datetime, timezone
+from uuid import UUID
+import asyncio
+import functools
+import itertools
 import logging
+import operator
 import random
+import string
 import httpx  # For making async HTTP requests
+import orjson
 import os
 import re
 
 COMBAT_LOG_URL = os.getenv("COMBAT_LOG_URL", "https://tba-app-production.up.railway.app/api/combat/log")
+COMBAT_LOG_BULK_URL = os.getenv("COMBAT_LOG_BULK_URL", COMBAT_LOG_URL.rstrip("/") + "/bulk")
+# The log endpoint sits behind the /api/ key check in backend/app.py
+API_KEY = os.getenv("API_KEY", "default-dev-key")
 WS_LOG_VERBOSITY = os.getenv("WS_LOG_VERBOSITY", "macros")  # macros|minimal|off
 try:
     WS_MACRO_THROTTLE_MS = int(os.getenv("WS_MACRO_THROTTLE_MS", "700"))
 except ValueError:
     WS_MACRO_THROTTLE_MS = 700
+try:
+    WS_MACRO_BURST = max(1, int(os.getenv("WS_MACRO_BURST", "1")))  # macros allowed back-to-back
+except ValueError:
+    WS_MACRO_BURST = 1
+try:
+    WS_LOG_QUEUE_MAX = int(os.getenv("WS_LOG_QUEUE_MAX", "1000"))
+except ValueError:
+    WS_LOG_QUEUE_MAX = 1000
+WS_LOG_BATCH_MAX = 64  # entries per bulk combat log POST
+WS_LOG_BATCH_WINDOW = 0.1  # seconds to wait for more entries before posting a batch
+try:
+    MESSAGE_QUEUE_MAX = int(os.getenv("MESSAGE_QUEUE_MAX", "10000"))
+except ValueError:
+    MESSAGE_QUEUE_MAX = 10000
+MESSAGE_BATCH_MAX = 500  # chat messages per batched INSERT
+MESSAGE_FLUSH_INTERVAL = 0.25  # seconds to wait for more chat messages before writing a batch
+try:
+    # Opt-in: hold party broadcasts this long and send bursts as one JSON array
+    # frame (clients must accept arrays); 0 sends every frame immediately
+    WS_COALESCE_MS = float(os.getenv("WS_COALESCE_MS", "0"))
+except ValueError:
+    WS_COALESCE_MS = 0.0
+try:
+    # Messages a whole party may send per sliding minute over WS; 0 disables
+    WS_PARTY_MSG_LIMIT = int(os.getenv("WS_PARTY_MSG_LIMIT", "600"))
+except ValueError:
+    WS_PARTY_MSG_LIMIT = 600
+SW_CHECK_TTL = 60.0  # seconds a DB-backed Story Weaver check is reused
 
 chat_blp = APIRouter()
 templates = Jinja2Templates(directory="templates")
 logger = logging.getLogger("uvicorn")
 
-# Macro throttle tracking (preserved for backward compatibility)
-macro_last_ts: Dict[str, float] = {}
+
+class TokenBucket:
+    """Macro rate limiter state for one actor: refills at `rate` tokens/sec up to `burst`."""
+    __slots__ = ("tokens", "last")
+
+    def __init__(self, tokens: float, last: float):
+        self.tokens = tokens
+        self.last = last
+
+    def acquire(self, now: float, rate: float, burst: float) -> bool:
+        """Spend one token if available."""
+        self.tokens = min(burst, self.tokens + (now - self.last) * rate)
+        self.last = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class PartyWindow:
+    """Sliding one-minute message count for a party, kept in 10-second buckets."""
+    __slots__ = ("buckets",)
+
+    def __init__(self):
+        self.buckets = deque(maxlen=6)  # [bucket_start, count], oldest first
+
+    def allow(self, now: float, limit: int) -> bool:
+        """Count one message unless the party already sent `limit` in the last minute."""
+        start = now - now % 10.0
+        cutoff = start - 50.0
+        if sum(count for bucket_start, count in self.buckets if bucket_start >= cutoff) >= limit:
+            return False
+        if not self.buckets or self.buckets[-1][0] != start:
+            self.buckets.append([start, 0])
+        self.buckets[-1][1] += 1
+        return True
+
+
+# Macro throttle buckets: {(party_id, actor): TokenBucket}
+macro_buckets: Dict[tuple[str, str], TokenBucket] = {}
+MACRO_BUCKET_IDLE_SECONDS = 600.0  # drop buckets of actors idle this long
+_macro_sweep_at: float = 0.0  # next time idle buckets may be swept
+
+
+def _sweep_macro_buckets(now: float):
+    """Evict idle actors' buckets, at most once a minute."""
+    global _macro_sweep_at
+    if now < _macro_sweep_at:
+        return
+    _macro_sweep_at = now + 60.0
+    cutoff = now - MACRO_BUCKET_IDLE_SECONDS
+    for key in [key for key, bucket in macro_buckets.items() if bucket.last < cutoff]:
+        del macro_buckets[key]
+
+
+# Combat stats projected from a Character/NPC row into the connection cache
+_CHAR_FIELDS = ("id", "name", "pp", "ip", "sp", "edge", "dp", "max_dp", "attack_style", "defense_die")
+_get_char_fields = operator.attrgetter(*_CHAR_FIELDS)
+
+
+# Per-roll line of the /attack outcome text
+_ROLL_LINE_FMT = "   Roll %d: %s vs %s → %s (%s damage)"
+
+# Macro replies containing any of these go only to the sender (errors, usage, help text)
+_PRIVATE_REPLY_PHRASES = (
+    "unknown command", "usage:", "not found", "error", "failed", "invalid",
+    "only the story weaver", "cannot verify", "has no ability uses",
+    "available commands", "📜"  # Help text markers
+)
+# Case-insensitive so the reply text is scanned without a lowercased copy
+_PRIVATE_REPLY_RE = re.compile("|".join(map(re.escape, _PRIVATE_REPLY_PHRASES)), re.IGNORECASE)
+
+# One /who target row: name, dp, max_dp, weapon, defense, presence emoji
+_WHO_FMT = "  @%s (DP: %s/%s, Weapon: %s, Defense: %s) %s"
+
+# Message type for broadcast chat by chat_mode, for frontend tab routing
+_MODE_TO_TYPE = {"ooc": "chat_ooc", "ic": "chat_ic"}
+
+# Header plus the only roll line, for single-die /attack weapons
+_SINGLE_ROLL_FMT = "⚔️ %s attacks %s\n\n🎲 Attack: %s = [%s] + PP(%s) + Edge(%s)\n   Roll 1: %s vs %s → %s (%s damage)"
+
+# Single-pass message_id sanitizer: ASCII uppercase -> lowercase, space -> underscore
+_SANITIZE_TABLE = str.maketrans({**{c: c.lower() for c in string.ascii_uppercase}, " ": "_"})
+
+
+# Last formatted log timestamp, reused for calls within the same millisecond
+_iso_at: float = 0.0
+_iso_text: str = ""
+
+
+def _now_iso() -> str:
+    """UTC ISO timestamp (same format as datetime.utcnow().isoformat()), cached per millisecond."""
+    global _iso_at, _iso_text
+    t = time()
+    if t - _iso_at > 0.001:
+        _iso_at = t
+        _iso_text = datetime.fromtimestamp(t, timezone.utc).replace(tzinfo=None).isoformat()
+    return _iso_text
+
+
+def _ws_json(message: Dict[str, Any]) -> str:
+    """Serialize an outbound WebSocket payload with orjson (UUIDs and datetimes included)."""
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _char_to_cache_dict(char, type_: str, **extra: Any) -> Dict[str, Any]:
+    """Project a Character or NPC row into the cached stats dict used by macros."""
+    return dict(zip(_CHAR_FIELDS, _get_char_fields(char)), type=type_, **extra)
+
+
+_ABILITY_FIELDS = ("display_name", "ability_type", "effect_type", "power_source", "die")
+_get_ability_fields = operator.attrgetter(*_ABILITY_FIELDS)
+
+
+def _load_abilities_by_macro(db: Session, character_id) -> Dict[str, Dict[str, Any]]:
+    """Load a character's abilities as plain dicts keyed by macro_command."""
+    abilities = db.execute(
+        select(Ability).where(Ability.character_id == character_id)
+    ).scalars().all()
+    return {a.macro_command: dict(zip(_ABILITY_FIELDS, _get_ability_fields(a))) for a in abilities}
 
 
 class ConnectionManager:
@@ -47,21 +207,42 @@ class ConnectionManager:
         # Structure: {party_id: [(ws, character_id, metadata)]}
         self.active_connections: Dict[str, List[tuple[WebSocket, str, Dict[str, Any]]]] = {}
 
+        # Sockets only, parallel to active_connections: {party_id: [ws]}
+        # Broadcast fan-out walks this flat list instead of unpacking tuples
+        self.party_sockets: Dict[str, List[WebSocket]] = {}
+
+        # Party-wide WS message rate: {party_id: PartyWindow}
+        self.party_windows: Dict[str, PartyWindow] = {}
+
+        # Broadcast frames waiting out the coalescing window: {party_id: [json_text]}
+        self.coalesce_pending: Dict[str, List[str]] = {}
+
         # Character cache: {party_id: {character_id: stats_dict}}
         self.character_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
+        # Name index over character_cache: {(party_id, lowercased_name): character_id}
+        # The first cached character holding a name keeps it, matching a scan of the cache
+        self.character_cache_by_name: Dict[tuple[str, str], str] = {}
+
         # Party metadata cache: {party_id: {"story_weaver_id": str}}
         self.party_cache: Dict[str, Dict[str, Any]] = {}
 
+        # Story Weaver checks answered from the DB: {party_id: {character_id: (expires_at, result)}}
+        self.sw_check_cache: Dict[str, Dict[str, tuple[float, tuple[bool, Optional[str]]]]] = {}
+
         # Active encounters: {party_id: encounter_data}
         self.active_encounters: Dict[str, Dict[str, Any]] = {}
 
+        # Party membership cache: {party_id: [character_id]}
+        # Invalidated on connection join and by membership add/remove routes
+        self.party_member_ids: Dict[str, List[Any]] = {}
+
     async def add_connection(
         self,
         party_id: str,
         ws: WebSocket,
         character_id: Optional[str] = None
-    ):
+    ) -> Dict[str, Any]:
         """
         Add a WebSocket connection and cache character data.
 
@@ -69,13 +250,20 @@ class ConnectionManager:
             party_id: The party ID
             ws: The WebSocket connection
             character_id: Optional character ID to associate with this connection
+
+        Returns:
+            The connection's metadata dict (role, character_id, character_name)
         """
         # Initialize party structures
         if party_id not in self.active_connections:
             self.active_connections[party_id] = []
+            self.party_sockets[party_id] = []
         if party_id not in self.character_cache:
             self.character_cache[party_id] = {}
 
+        # A join may follow a membership change; reload members on next use
+        self.invalidate_party_members(party_id)
+
         # Fetch and cache character data if provided
         metadata = {"role": "player", "character_id": character_id}
 
@@ -84,10 +272,10 @@ class ConnectionManager:
             try:
                 # Try to load campaign metadata (for SW check)
                 if party_id not in self.party_cache:
-                    party = db.query(Party).filter(Party.id == party_id).first()
+                    party = db.get(Party, party_id)
                     if party and party.campaign_id:
                         # Get the Story Weaver from the Campaign, not the Party
-                        campaign = db.query(Campaign).filter(Campaign.id == party.campaign_id).first()
+                        campaign = db.get(Campaign, party.campaign_id)
                         if campaign:
                             self.party_cache[party_id] = {
                                 "story_weaver_id": campaign.story_weaver_id,
@@ -108,46 +296,28 @@ class ConnectionManager:
                 metadata["role"] = "SW" if is_sw else "player"
 
                 # Try Character first
-                character = db.query(Character).filter(Character.id == character_id).first()
+                character = db.get(Character, character_id)
 
                 if character:
-                    self.character_cache[party_id][character_id] = {
-                        "id": character.id,
-                        "name": character.name,
-                        "type": "character",
-                        "pp": character.pp,
-                        "ip": character.ip,
-                        "sp": character.sp,
-                        "edge": character.edge,
-                        "bap": character.bap,
-                        "level": character.level,
-                        "dp": character.dp,
-                        "max_dp": character.max_dp,
-                        "attack_style": character.attack_style,
-                        "defense_die": character.defense_die
-                    }
+                    # Abilities are loaded once here so macro dispatch is a dict lookup
+                    self.cache_character(party_id, character_id, _char_to_cache_dict(
+                        character, "character",
+                        bap=character.bap,
+                        level=character.level,
+                        abilities_by_macro=_load_abilities_by_macro(db, character.id)
+                    ))
                     metadata["character_name"] = character.name
                 else:
                     # Try NPC
-                    npc = db.query(NPC).filter(NPC.id == character_id).first()
+                    npc = db.get(NPC, character_id)
                     if npc:
-                        self.character_cache[party_id][character_id] = {
-                            "id": npc.id,
-                            "name": npc.name,
-                            "type": "npc",
-                            "pp": npc.pp,
-                            "ip": npc.ip,
-                            "sp": npc.sp,
-                            "edge": npc.edge,
-                            "bap": npc.bap,
-                            "level": npc.level,
-                            "dp": npc.dp,
-                            "max_dp": npc.max_dp,
-                            "attack_style": npc.attack_style,
-                            "defense_die": npc.defense_die,
-                            "npc_type": npc.npc_type,
-                            "visible_to_players": npc.visible_to_players
-                        }
+                        self.cache_character(party_id, character_id, _char_to_cache_dict(
+                            npc, "npc",
+                            bap=npc.bap,
+                            level=npc.level,
+                            npc_type=npc.npc_type,
+                            visible_to_players=npc.visible_to_players
+                        ))
                         metadata["character_name"] = npc.name
                     else:
                         logger.warning(f"Character/NPC not found: {character_id}")
@@ -159,10 +329,12 @@ class ConnectionManager:
 
         # Add connection with metadata
         self.active_connections[party_id].append((ws, character_id or "", metadata))
+        self.party_sockets[party_id].append(ws)
         logger.info(
-            f"Connection added: party={party_id}, character={character_id}, "
-            f"role={metadata['role']}, total_connections={len(self.active_connections[party_id])}"
+            "Connection added: party=%s, character=%s, role=%s, total_connections=%d",
+            party_id, character_id, metadata["role"], len(self.active_connections[party_id])
         )
+        return metadata
 
     def remove_connection(self, party_id: str, ws: WebSocket):
         """Remove a WebSocket connection and clean up if party is empty."""
@@ -172,24 +344,68 @@ class ConnectionManager:
                 (w, cid, meta) for w, cid, meta in self.active_connections[party_id]
                 if w != ws
             ]
+            self.party_sockets[party_id] = [w for w, _, _ in self.active_connections[party_id]]
 
             # Clean up empty party
             if not self.active_connections[party_id]:
                 del self.active_connections[party_id]
+                del self.party_sockets[party_id]
                 # Also clear character cache for this party
-                if party_id in self.character_cache:
-                    del self.character_cache[party_id]
+                for data in self.character_cache.pop(party_id, {}).values():
+                    self.character_cache_by_name.pop((party_id, (data.get("name") or "").lower()), None)
                 if party_id in self.party_cache:
                     del self.party_cache[party_id]
-                logger.info(f"Party {party_id} cleaned up (no active connections)")
+                self.sw_check_cache.pop(party_id, None)
+                self.party_windows.pop(party_id, None)
+                self.invalidate_party_members(party_id)
+                logger.info("Party %s cleaned up (no active connections)", party_id)
 
     async def broadcast(self, party_id: str, message: Dict[str, Any]):
         """Broadcast a message to all connections in a party."""
-        for ws, _, _ in self.active_connections.get(party_id, []):
-            try:
-                await ws.send_json(message)
-            except Exception as e:
-                logger.warning(f"Broadcast failed to connection: {e}")
+        await self.broadcast_text(party_id, _ws_json(message))
+
+    async def broadcast_text(self, party_id: str, data: str):
+        """
+        Send an already-serialized JSON frame to all connections in a party.
+
+        The payload is encoded once by the caller and fanned out concurrently,
+        rather than re-serialized for every socket. With WS_COALESCE_MS set,
+        frames are held briefly and bursts go out as one JSON array frame.
+        """
+        if WS_COALESCE_MS > 0:
+            self._queue_coalesced(party_id, data)
+            return
+        await self._send_all(party_id, data)
+
+    def _queue_coalesced(self, party_id: str, data: str):
+        """Hold a frame for the party's coalescing window, starting one if needed."""
+        pending = self.coalesce_pending.get(party_id)
+        if pending is None:
+            pending = self.coalesce_pending[party_id] = []
+            asyncio.get_running_loop().call_later(
+                WS_COALESCE_MS / 1000.0, self._flush_coalesced, party_id
+            )
+        pending.append(data)
+
+    def _flush_coalesced(self, party_id: str):
+        """Send a party's held frames: a lone frame as-is, a burst as one array."""
+        frames = self.coalesce_pending.pop(party_id, None)
+        if not frames:
+            return
+        data = frames[0] if len(frames) == 1 else "[" + ",".join(frames) + "]"
+        task = asyncio.get_running_loop().create_task(self._send_all(party_id, data))
+        _bg_tasks.add(task)
+        task.add_done_callback(_bg_tasks.discard)
+
+    async def _send_all(self, party_id: str, data: str):
+        """Write one frame to every socket in a party."""
+        results = await asyncio.gather(
+            *(ws.send_text(data) for ws in self.party_sockets.get(party_id, ())),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Broadcast failed to connection: {result}")
                 # Connection will be cleaned up on next disconnect
 
     async def broadcast_whisper(
@@ -209,26 +425,31 @@ class ConnectionManager:
             sender_name: Name of the sender (so they don't receive their own message back)
         """
         # Normalize target names for case-insensitive matching
-        target_names_lower = [name.lower() for name in target_names]
+        target_names_lower = set(name.lower() for name in target_names)
         sender_name_lower = sender_name.lower() if sender_name else ""
 
+        # Send to: targets, Story Weaver (always sees whispers), but not back to sender
+        recipients = []
         for ws, char_id, metadata in self.active_connections.get(party_id, []):
-            try:
-                char_name = metadata.get("character_name", "").lower()
-                is_sw = metadata.get("role") == "SW"
-
-                # Send to: targets, Story Weaver (always sees whispers), but not back to sender
-                should_receive = (
-                    (char_name in target_names_lower and char_name != sender_name_lower) or
-                    (is_sw and char_name != sender_name_lower)
-                )
+            char_name = metadata.get("character_name", "").lower()
+            if char_name != sender_name_lower and (
+                char_name in target_names_lower or metadata.get("role") == "SW"
+            ):
+                recipients.append(ws)
 
-                if should_receive:
-                    await ws.send_json(message)
-                    logger.debug(f"Whisper sent to {char_name} (SW={is_sw})")
+        if not recipients:
+            return
 
-            except Exception as e:
-                logger.warning(f"Whisper broadcast failed to connection: {e}")
+        # Encode once, then fan out like broadcast_text
+        data = _ws_json(message)
+        results = await asyncio.gather(
+            *(ws.send_text(data) for ws in recipients),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Whisper broadcast failed to connection: {result}")
+        logger.debug("Whisper sent to %d connection(s)", len(recipients))
 
     async def send_to_character(
         self,
@@ -247,12 +468,46 @@ class ConnectionManager:
         for ws, char_id, _ in self.active_connections.get(party_id, []):
             try:
                 if char_id == character_id:
-                    await ws.send_json(message)
-                    logger.debug(f"Private message sent to character {character_id}")
+                    await ws.send_text(_ws_json(message))
+                    logger.debug("Private message sent to character %s", character_id)
                     return
             except Exception as e:
                 logger.warning(f"Send to character failed: {e}")
 
+    def cache_character(self, party_id: str, character_id: str, data: Dict[str, Any]):
+        """
+        Store character stats in the cache and index them by lowercased name.
+
+        A rename drops the old name from the index (handing it to another cached
+        character with that name, if any); a name already held by another cached
+        character is left pointing at that character.
+        """
+        party_chars = self.character_cache.setdefault(party_id, {})
+        previous = party_chars.get(character_id)
+        party_chars[character_id] = data
+        name = (data.get("name") or "").lower()
+        if previous is not None:
+            old_name = (previous.get("name") or "").lower()
+            if old_name != name and self.character_cache_by_name.get((party_id, old_name)) == character_id:
+                del self.character_cache_by_name[(party_id, old_name)]
+                for other_id, other in party_chars.items():
+                    if (other.get("name") or "").lower() == old_name:
+                        self.character_cache_by_name[(party_id, old_name)] = other_id
+                        break
+        self.character_cache_by_name.setdefault((party_id, name), character_id)
+
+    def find_character_by_name(self, party_id: str, name: str) -> tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Look up cached character stats by name (case-insensitive).
+
+        Returns:
+            Tuple of (character_id, stats_dict), or (None, None) if not cached
+        """
+        character_id = self.character_cache_by_name.get((party_id, name.lower()))
+        if character_id is None:
+            return None, None
+        return character_id, self.character_cache.get(party_id, {}).get(character_id)
+
     def get_character_stats(self, party_id: str, character_id: str) -> Optional[Dict[str, Any]]:
         """
         Get cached character stats.
@@ -262,6 +517,39 @@ class ConnectionManager:
         """
         return self.character_cache.get(party_id, {}).get(character_id)
 
+    def invalidate_character_abilities(self, character_id: str):
+        """Drop a character's cached abilities in every party (call when abilities change)."""
+        for characters in self.character_cache.values():
+            cached = characters.get(character_id)
+            if cached is not None:
+                cached.pop("abilities_by_macro", None)
+
+    def get_party_member_ids(self, party_id: str, db) -> List[Any]:
+        """
+        Get the character IDs in a party, querying party_memberships only on a cache miss.
+
+        Returns:
+            List of Character IDs (may be empty)
+        """
+        member_ids = self.party_member_ids.get(party_id)
+        if member_ids is None:
+            member_ids = db.execute(
+                select(PartyMembership.character_id).where(PartyMembership.party_id == party_id)
+            ).scalars().all()
+            self.party_member_ids[party_id] = member_ids
+        return member_ids
+
+    def invalidate_party_members(self, party_id: str):
+        """Drop the cached member list for a party (call when membership changes)."""
+        self.party_member_ids.pop(party_id, None)
+
+    def invalidate_sw_checks(self, party_id: Optional[str] = None):
+        """Drop cached Story Weaver checks for a party, or for every party (call when roles change)."""
+        if party_id is None:
+            self.sw_check_cache.clear()
+        else:
+            self.sw_check_cache.pop(party_id, None)
+
     def get_party_sw(self, party_id: str) -> Optional[str]:
         """
         Get the Story Weaver character ID for a party.
@@ -463,25 +751,30 @@ class ConnectionManager:
 
         return encounter['turn_order'][encounter['current_turn_index']]
 
-    def next_turn(self, party_id: str):
+    def next_turn(self, party_id: str) -> tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
         """
         Advance to next combatant, increment turn_number if looped.
-        """
-        if party_id not in self.active_encounters:
-            return
-
-        encounter = self.active_encounters[party_id]
 
-        if not encounter['turn_order']:
-            return
+        Returns:
+            Tuple of (encounter, current combatant); (None, None) if there is
+            no active encounter or turn order
+        """
+        encounter = self.active_encounters.get(party_id)
+        if not encounter:
+            return None, None
 
-        # Advance index
-        encounter['current_turn_index'] += 1
+        turn_order = encounter['turn_order']
+        if not turn_order:
+            return None, None
 
-        # Wrap around and increment turn number
-        if encounter['current_turn_index'] >= len(encounter['turn_order']):
-            encounter['current_turn_index'] = 0
+        # Advance index, wrapping around and incrementing turn number
+        index = encounter['current_turn_index'] + 1
+        if index >= len(turn_order):
+            index = 0
             encounter['turn_number'] += 1
+        encounter['current_turn_index'] = index
+
+        return encounter, turn_order[index]
 
     def get_turn_number(self, party_id: str) -> int:
         """Get current turn number for encounter."""
@@ -532,7 +825,7 @@ def save_message_to_db(
     db = SessionLocal()
     try:
         # Get party to find campaign_id
-        party = db.query(Party).filter(Party.id == party_id).first()
+        party = db.get(Party, party_id)
         if not party or not party.campaign_id:
             logger.warning(f"Cannot save message: party {party_id} not found or has no campaign")
             return None
@@ -561,6 +854,137 @@ def save_message_to_db(
         db.close()
 
 
+async def _drain_batch(queue: asyncio.Queue, max_items: int, window: float) -> List[Any]:
+    """Wait for one queued item, then collect more until max_items or window seconds pass."""
+    loop = asyncio.get_running_loop()
+    batch = [await queue.get()]
+    deadline = loop.time() + window
+    while len(batch) < max_items:
+        if not queue.empty():
+            batch.append(queue.get_nowait())
+            continue
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), remaining))
+        except asyncio.TimeoutError:
+            break
+    return batch
+
+
+async def _stop_worker(task: Optional[asyncio.Task], queue: Optional[asyncio.Queue], timeout: float, label: str):
+    """Wait for a worker's queue to drain, then cancel the worker."""
+    if task is None or task.done():
+        return
+    try:
+        await asyncio.wait_for(queue.join(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Dropped {queue.qsize()} {label} on shutdown")
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+# Chat messages from the WebSocket loop are written in batches by one
+# background task instead of an INSERT + commit per message
+_message_queue: Optional[asyncio.Queue] = None
+_message_writer_task: Optional[asyncio.Task] = None
+
+
+def _write_message_batch(rows: List[Dict[str, Any]]):
+    """Insert queued chat messages, resolving each party's campaign once per batch."""
+    db = SessionLocal()
+    try:
+        party_ids = {row["party_id"] for row in rows}
+        campaigns = dict(db.execute(
+            select(Party.id, Party.campaign_id).where(Party.id.in_(party_ids))
+        ).all())
+        # Party ids arrive as strings; normalize the keys for lookup
+        campaigns = {str(pid): cid for pid, cid in campaigns.items()}
+
+        mappings = []
+        for row in rows:
+            campaign_id = campaigns.get(str(row["party_id"]))
+            if not campaign_id:
+                logger.warning(f"Cannot save message: party {row['party_id']} not found or has no campaign")
+                continue
+            mappings.append({**row, "campaign_id": campaign_id})
+        if not mappings:
+            return
+
+        try:
+            db.execute(insert(Message), mappings)
+            db.commit()
+        except Exception as e:
+            # Fall back to one row at a time so a bad row doesn't drop the batch
+            logger.error(f"Batched message insert failed, retrying individually: {e}")
+            db.rollback()
+            for mapping in mappings:
+                try:
+                    db.execute(insert(Message), [mapping])
+                    db.commit()
+                except Exception as row_error:
+                    logger.error(f"Failed to save message to database: {row_error}")
+                    db.rollback()
+    except Exception as e:
+        logger.error(f"Failed to save message batch to database: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def _message_writer(queue: asyncio.Queue):
+    """Write queued chat messages in batches off the event loop."""
+    while True:
+        batch = await _drain_batch(queue, MESSAGE_BATCH_MAX, MESSAGE_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(_write_message_batch, batch)
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+def queue_message_for_db(
+    party_id: str,
+    character_id: Optional[str],
+    character_name: str,
+    message_text: str,
+    message_type: str = 'chat',
+    chat_mode: Optional[str] = None
+):
+    """Queue a chat message for the batched writer; same arguments as save_message_to_db."""
+    global _message_queue, _message_writer_task
+    loop = asyncio.get_running_loop()
+    if _message_writer_task is None or _message_writer_task.done() or _message_writer_task.get_loop() is not loop:
+        _message_queue = asyncio.Queue(maxsize=MESSAGE_QUEUE_MAX)
+        _message_writer_task = loop.create_task(_message_writer(_message_queue))
+    if _message_queue.full():
+        # Never block the WS loop on a stalled database; the live broadcast already went out
+        logger.warning(f"Chat message queue full; not persisting message for party {party_id}")
+        return
+    _message_queue.put_nowait({
+        "party_id": party_id,
+        "sender_id": character_id or "system",
+        "sender_name": character_name,
+        "message_type": message_type,
+        "mode": chat_mode,
+        "content": message_text,
+        # Stamp now so history order and keyset cursors reflect send time
+        "created_at": datetime.utcnow(),
+    })
+
+
+async def close_message_writer(timeout: float = 5.0):
+    """Flush queued chat messages and stop the writer (app shutdown)."""
+    global _message_queue, _message_writer_task
+    task, queue = _message_writer_task, _message_queue
+    _message_writer_task = _message_queue = None
+    await _stop_worker(task, queue, timeout, "chat messages")
+
+
 # ============================================================================
 # COMBAT TURN DATABASE LOGGING (Phase 2b Task 3)
 # ============================================================================
@@ -603,7 +1027,10 @@ async def log_combat_action(
     turn_number = connection_manager.get_turn_number(party_id)
 
     # Generate message_id: lowercase name with underscores, plus turn number
-    sanitized_name = combatant_name.lower().replace(' ', '_')
+    if combatant_name.isascii():
+        sanitized_name = combatant_name.translate(_SANITIZE_TABLE)
+    else:
+        sanitized_name = combatant_name.lower().replace(' ', '_')
     message_id = f"{sanitized_name}_turn_{turn_number}"
 
     # Create database record
@@ -621,9 +1048,8 @@ async def log_combat_action(
         )
         db.add(turn)
         db.commit()
-        db.refresh(turn)
 
-        logger.info(f"Combat action logged: {message_id} ({action_type}) in party {party_id}")
+        logger.info("Combat action logged: %s (%s) in party %s", message_id, action_type, party_id)
         return message_id
 
     except Exception as e:
@@ -634,22 +1060,30 @@ async def log_combat_action(
         db.close()
 
 
-def get_combat_history(party_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+def get_combat_history(
+    party_id: str,
+    limit: int = 50,
+    before: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
     """
     Get recent combat turn history for a party.
 
     Args:
         party_id: Party UUID
         limit: Maximum number of turns to retrieve (default 50)
+        before: Keyset cursor - only return turns older than this timestamp.
+                Pass the oldest timestamp from the previous page to paginate.
 
     Returns:
         List of combat turn records, ordered by timestamp (newest first)
     """
     db = SessionLocal()
     try:
-        turns = db.query(CombatTurn).filter(
-            CombatTurn.party_id == party_id
-        ).order_by(
+        query = db.query(CombatTurn).filter(CombatTurn.party_id == party_id)
+        if before is not None:
+            query = query.filter(CombatTurn.timestamp < before)
+
+        turns = query.order_by(
             CombatTurn.timestamp.desc()
         ).limit(limit).all()
 
@@ -684,14 +1118,24 @@ def mark_turn_bap_applied(message_id: str) -> bool:
     """
     db = SessionLocal()
     try:
-        turn = db.query(CombatTurn).filter(
+        # Single UPDATE ... RETURNING round-trip; message_id is not unique across
+        # encounters, so flag only the most recent matching turn
+        latest_turn_id = select(CombatTurn.id).where(
             CombatTurn.message_id == message_id
-        ).first()
+        ).order_by(CombatTurn.timestamp.desc()).limit(1).scalar_subquery()
+
+        result = db.execute(
+            update(CombatTurn)
+            .where(CombatTurn.id == latest_turn_id)
+            .values(bap_applied=True)
+            .returning(CombatTurn.id)
+            .execution_options(synchronize_session=False)
+        )
+        hit = result.first() is not None
+        db.commit()
 
-        if turn:
-            turn.bap_applied = True
-            db.commit()
-            logger.info(f"BAP applied to turn: {message_id}")
+        if hit:
+            logger.info("BAP applied to turn: %s", message_id)
             return True
 
         logger.warning(f"Combat turn not found: {message_id}")
@@ -705,11 +1149,22 @@ def mark_turn_bap_applied(message_id: str) -> bool:
         db.close()
 
 
+# Strong references to fire-and-forget tasks so they aren't garbage-collected mid-await
+_bg_tasks: set = set()
+
+
 # Legacy functions (preserved for backward compatibility with existing code)
-def add_connection(party_id: str, ws: WebSocket):
-    """Legacy: Add connection without character_id (for backward compatibility)."""
-    import asyncio
-    asyncio.create_task(connection_manager.add_connection(party_id, ws, None))
+def add_connection(party_id: str, ws: WebSocket) -> asyncio.Task:
+    """
+    Legacy: Add connection without character_id (for backward compatibility).
+
+    New code should ``await connection_manager.add_connection(...)`` directly.
+    The returned task can be awaited to know when the socket is registered.
+    """
+    task = asyncio.create_task(connection_manager.add_connection(party_id, ws, None))
+    _bg_tasks.add(task)
+    task.add_done_callback(_bg_tasks.discard)
+    return task
 
 
 def remove_connection(party_id: str, ws: WebSocket):
@@ -725,29 +1180,58 @@ async def broadcast(party_id: str, message: Dict[str, Any]):
 async def broadcast_combat_event(party_id: str, event: Dict[str, Any]):
     """Broadcast a combat event to all sockets in a party."""
     payload = {"type": "combat_event", "party_id": party_id, **event}
-    await broadcast(party_id, payload)
+    await connection_manager.broadcast_text(party_id, _ws_json(payload))
 
 
-async def log_if_allowed(event_type: str, entry: Dict[str, Any]):
-    """Log macro events based on verbosity setting."""
+def log_if_allowed(event_type: str, entry_factory: Callable[[], Dict[str, Any]]):
+    """
+    Log macro events based on verbosity setting.
+
+    The entry is built lazily via entry_factory, so silenced events never
+    pay for the dict or its timestamp.
+    """
     if WS_LOG_VERBOSITY == "off":
         return
     if WS_LOG_VERBOSITY == "minimal" and event_type not in {"dice_roll", "initiative"}:
         return
-    await log_combat_event(entry)
+    log_combat_event(entry_factory())
+
+
+_DICE_RE = re.compile(r"\s*(\d+)d(\d+)([+\-]\d+)?\s*")
+
+# Pre-parsed (count, sides) for the plain expressions used by initiative,
+# stat checks and default attack/defense dice
+_FAST_DICE = {
+    "1d4": (1, 4), "1d6": (1, 6), "1d8": (1, 8), "1d10": (1, 10),
+    "1d12": (1, 12), "1d20": (1, 20), "2d4": (2, 4), "2d6": (2, 6),
+}
+
+
+def _roll_core(count: int, sides: int, modifier: int) -> Dict[str, Any]:
+    """Roll count dice of the given sides and total them with the modifier."""
+    randint = random.randint
+    rolls = [randint(1, sides) for _ in range(count)]
+    return {"rolls": rolls, "modifier": modifier, "total": sum(rolls) + modifier}
+
+
+def _release_session(db: Session, shared: Optional[Session]) -> None:
+    """Close a per-call session, or just end the transaction on a shared one."""
+    if db is shared:
+        db.rollback()
+    else:
+        db.close()
 
 
 def parse_dice_notation(expr: str) -> Dict[str, Any]:
     """Parse dice like '3d6+2' and roll it. Returns breakdown and total."""
-    m = re.fullmatch(r"\s*(\d+)d(\d+)([+\-]\d+)?\s*", expr)
+    fast = _FAST_DICE.get(expr)
+    if fast is not None:
+        return _roll_core(fast[0], fast[1], 0)
+    m = _DICE_RE.fullmatch(expr)
     if not m:
         raise ValueError("Invalid dice expression. Try like 3d6+2")
-    num = int(m.group(1))
-    sides = int(m.group(2))
-    mod = int(m.group(3)) if m.group(3) else 0
-    rolls = [random.randint(1, sides) for _ in range(num)]
-    total = sum(rolls) + mod
-    return {"rolls": rolls, "modifier": mod, "total": total}
+    num, sides, mod = m.groups()
+    return _roll_core(int(num), int(sides), int(mod) if mod else 0)
 
 
 def check_story_weaver(character_id: Optional[str], party_id: str) -> tuple[bool, Optional[str]]:
@@ -773,20 +1257,33 @@ def check_story_weaver(character_id: Optional[str], party_id: str) -> tuple[bool
             return True, None
         return False, "⚠️ Only the Story Weaver can use this command."
 
-    # Fallback to database query
+    # Fallback to database query, reusing a recent answer for this character.
+    # Only parties with a live connection are cached; their entry is dropped on
+    # disconnect and by the membership routes via invalidate_sw_checks
+    party_checks = None
+    if party_id in connection_manager.active_connections:
+        party_checks = connection_manager.sw_check_cache.setdefault(party_id, {})
+        now = monotonic()
+        cached = party_checks.get(character_id)
+        if cached and cached[0] > now:
+            return cached[1]
+
     db = SessionLocal()
     try:
-        party = db.query(Party).filter(Party.id == party_id).first()
+        party = db.get(Party, party_id)
         if not party:
-            return False, "Party not found."
-
-        if character_id != party.story_weaver_id:
-            return False, "⚠️ Only the Story Weaver can use this command."
-
-        return True, None
+            result = (False, "Party not found.")
+        elif character_id != party.story_weaver_id:
+            result = (False, "⚠️ Only the Story Weaver can use this command.")
+        else:
+            result = (True, None)
     finally:
         db.close()
 
+    if party_checks is not None:
+        party_checks[character_id] = (now + SW_CHECK_TTL, result)
+    return result
+
 
 async def handle_ability_macro(
     party_id: str,
@@ -794,7 +1291,9 @@ async def handle_ability_macro(
     macro_command: str,
     target_args: str,
     character_id: Optional[str],
-    context: Optional[str] = None
+    context: Optional[str] = None,
+    include_text: bool = True,
+    db_session: Optional[Session] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Handle custom ability/spell execution via macro command.
@@ -805,34 +1304,47 @@ async def handle_ability_macro(
     3. Execute attack: roll spell die + power_source_stat + edge vs defense
     4. Apply damage and broadcast results
 
+    Args:
+        include_text: Build the pre-rendered chat "text" and the
+                      spell_breakdown/defense_breakdown strings for a successful
+                      cast. Clients that render from the structured fields
+                      (breakdown, defense_breakdown_rolls) can pass False to
+                      skip them.
+        db_session: The WebSocket connection's session to reuse; a
+                    short-lived one is opened when omitted.
+
     Returns:
         Dict with spell_cast event data, or None if not a custom ability
     """
     if not character_id:
         return None
 
-    db = SessionLocal()
+    db = db_session if db_session is not None else SessionLocal()
     try:
         # 1. Look up ability by macro_command for this character
-        ability = db.query(Ability).filter(
-            Ability.character_id == character_id,
-            Ability.macro_command == macro_command
-        ).first()
+        # (cached on connect; reloaded after the ability routes invalidate it)
+        cached_char = connection_manager.get_character_stats(party_id, character_id)
+        abilities = cached_char.get("abilities_by_macro") if cached_char else None
+        if abilities is None:
+            abilities = _load_abilities_by_macro(db, character_id)
+            if cached_char is not None:
+                cached_char["abilities_by_macro"] = abilities
+        ability = abilities.get(macro_command)
 
         if not ability:
             return None  # Not a custom ability, let other handlers try
 
         # 2. Validate effect_type is 'damage' (only type we support for MVP)
-        if ability.effect_type != 'damage':
+        if ability["effect_type"] != 'damage':
             return {
                 "type": "system",
                 "actor": "system",
-                "text": f"⚠️ {ability.display_name} is a {ability.effect_type} ability. Only attack (damage) abilities are supported for MVP.",
+                "text": f"⚠️ {ability['display_name']} is a {ability['effect_type']} ability. Only attack (damage) abilities are supported for MVP.",
                 "party_id": party_id
             }
 
         # Get caster data
-        caster = db.query(Character).filter(Character.id == character_id).first()
+        caster = db.get(Character, character_id)
         if not caster:
             return {
                 "type": "system",
@@ -859,8 +1371,6 @@ async def handle_ability_macro(
                 "party_id": party_id
             }
 
-        from backend.mention_parser import parse_mentions
-
         # Determine if sender is SW for hidden NPC visibility
         sender_is_sw = connection_manager.is_story_weaver(party_id, character_id)
 
@@ -891,9 +1401,9 @@ async def handle_ability_macro(
 
         # 5. Get target data
         if target_type == "character":
-            target = db.query(Character).filter(Character.id == target_id).first()
+            target = db.get(Character, target_id)
         else:  # npc
-            target = db.query(NPC).filter(NPC.id == target_id).first()
+            target = db.get(NPC, target_id)
 
         if not target:
             return {
@@ -917,12 +1427,12 @@ async def handle_ability_macro(
 
         # 6. Execute attack spell
         # Get power source stat value
-        power_source = ability.power_source.lower()  # 'pp', 'ip', or 'sp'
+        power_source = ability["power_source"].lower()  # 'pp', 'ip', or 'sp'
         caster_stat_value = getattr(caster, power_source, 1)
         caster_edge = caster.edge or 0
 
         # Parse and roll spell die
-        spell_die = ability.die  # e.g., "2d6", "1d8"
+        spell_die = ability["die"]  # e.g., "2d6", "1d8"
         spell_roll_result = parse_dice_notation(spell_die)
         spell_base_roll = spell_roll_result["total"] - spell_roll_result["modifier"]  # Get just the dice
         spell_total = spell_base_roll + caster_stat_value + caster_edge
@@ -956,63 +1466,49 @@ async def handle_ability_macro(
         # 9. Decrement caster's current_uses
         caster.current_uses = max(0, caster.current_uses - 1)
 
-        # 10. Check for unconscious status at 0 DP or below
-        knocked_out = False
-        calling_triggered = False
-
-        # Get current target status
+        # 10. Unconscious at 0 DP or below; 11. The Calling at -10 DP (only for PCs, not NPCs)
         current_status = getattr(target, 'status', 'active')
-        if new_dp <= 0 and current_status == 'active':
+        knocked_out = new_dp <= 0 and current_status == 'active'
+        calling_triggered = (
+            target_type == "character" and new_dp <= -10
+            and not target.is_npc and not target.in_calling
+        )
+        if knocked_out:
             target.status = 'unconscious'
-            knocked_out = True
-
-        # 11. Check for The Calling at -10 DP (only for PCs, not NPCs)
-        if target_type == "character" and new_dp <= -10 and not target.is_npc:
-            if not target.in_calling:
-                target.in_calling = True
-                calling_triggered = True
+        if calling_triggered:
+            target.in_calling = True
 
         db.commit()
 
         # Update cache if target is cached
-        if target_id in connection_manager.character_cache.get(party_id, {}):
-            connection_manager.character_cache[party_id][target_id]["dp"] = new_dp
+        cached_target = connection_manager.get_character_stats(party_id, target_id)
+        if cached_target is not None:
+            cached_target["dp"] = new_dp
             if knocked_out:
-                connection_manager.character_cache[party_id][target_id]["status"] = 'unconscious'
+                cached_target["status"] = 'unconscious'
 
         # 11. Build broadcast message
-        # Format spell roll breakdown
-        spell_rolls_str = " + ".join(map(str, spell_roll_result["rolls"]))
-        spell_breakdown = f"{spell_die} = [{spell_rolls_str}] + {power_source.upper()}({caster_stat_value}) + Edge({caster_edge}) = {spell_total}"
-
-        # Format defense roll breakdown
-        if target_dp <= 0:
-            defense_breakdown = "No defense (unconscious)"
-        else:
-            defense_rolls_str = " + ".join(map(str, defense_roll_result["rolls"]))
-            defense_breakdown = f"{defense_die} = [{defense_rolls_str}] + PP({target_pp}) + Edge({target_edge}) = {defense_total}"
-
         # Determine outcome text
         if damage > 0:
             outcome_text = f"💥 {damage} damage! {target_name} at {new_dp}/{target.max_dp or 20} DP"
         else:
             outcome_text = f"🛡️ No damage! {target_name} defends successfully ({new_dp}/{target.max_dp or 20} DP)"
 
-        # Build result message
+        # Build result message (raw rolls let clients render their own breakdowns)
         result = {
             "type": "spell_cast",
             "actor": actor,
             "caster_name": caster.name,
             "target_name": target_name,
-            "spell_name": ability.display_name,
-            "ability_type": ability.ability_type,
-            "power_source": ability.power_source,
+            "spell_name": ability["display_name"],
+            "ability_type": ability["ability_type"],
+            "power_source": ability["power_source"],
             "spell_die": spell_die,
             "spell_roll": spell_total,
-            "spell_breakdown": spell_breakdown,
+            "breakdown": spell_roll_result["rolls"],
             "defense_die": defense_die,
             "defense_roll": defense_total,
-            "defense_breakdown": defense_breakdown,
+            "defense_breakdown_rolls": defense_roll_result["rolls"],
             "damage": damage,
             "target_old_dp": old_dp,
             "target_new_dp": new_dp,
@@ -1021,21 +1517,40 @@ async def handle_ability_macro(
             "caster_max_uses": caster.max_uses_per_encounter,
             "outcome_text": outcome_text,
             "knocked_out": knocked_out,
-            "party_id": party_id,
-            "text": f"✨ {caster.name} casts {ability.display_name} on {target_name}!\n"
-                    f"🎲 Attack: {spell_breakdown}\n"
-                    f"🛡️ Defense: {defense_breakdown}\n"
-                    f"{outcome_text}"
+            "party_id": party_id
         }
 
+        if include_text:
+            # Format spell roll breakdown
+            spell_rolls_str = " + ".join(map(str, spell_roll_result["rolls"]))
+            spell_breakdown = f"{spell_die} = [{spell_rolls_str}] + {power_source.upper()}({caster_stat_value}) + Edge({caster_edge}) = {spell_total}"
+
+            # Format defense roll breakdown
+            if target_dp <= 0:
+                defense_breakdown = "No defense (unconscious)"
+            else:
+                defense_rolls_str = " + ".join(map(str, defense_roll_result["rolls"]))
+                defense_breakdown = f"{defense_die} = [{defense_rolls_str}] + PP({target_pp}) + Edge({target_edge}) = {defense_total}"
+
+            result["spell_breakdown"] = spell_breakdown
+            result["defense_breakdown"] = defense_breakdown
+            result["text"] = (
+                f"✨ {caster.name} casts {ability['display_name']} on {target_name}!\n"
+                f"🎲 Attack: {spell_breakdown}\n"
+                f"🛡️ Defense: {defense_breakdown}\n"
+                f"{outcome_text}"
+            )
+
         # Add knockout message if applicable
         if knocked_out:
-            result["text"] += f"\n💀 {target_name} is knocked unconscious!"
+            if include_text:
+                result["text"] += f"\n💀 {target_name} is knocked unconscious!"
             result["knockout_message"] = f"{target_name} is knocked unconscious!"
 
         # Add calling trigger if applicable
         if calling_triggered:
-            result["text"] += f"\n⚠️ {target_name} has reached -10 DP and enters The Calling!"
+            if include_text:
+                result["text"] += f"\n⚠️ {target_name} has reached -10 DP and enters The Calling!"
             result["calling_triggered"] = True
             result["calling_message"] = f"{target_name} enters The Calling!"
             result["character_id"] = str(target_id)
@@ -1056,11 +1571,16 @@ async def handle_ability_macro(
             "party_id": party_id
         }
     finally:
-        db.close()
+        _release_session(db, db_session)
+
 
+async def handle_macro(party_id: str, actor: str, text: str, context: Optional[str] = None, encounter_id: Optional[str] = None, character_id: Optional[str] = None, include_text: bool = True, db_session: Optional[Session] = None) -> Dict[str, Any]:
+    """
+    Handle simple system macros: /roll, /pp, /ip, /sp, /initiative, /attack, /defend, combat management.
 
-async def handle_macro(party_id: str, actor: str, text: str, context: Optional[str] = None, encounter_id: Optional[str] = None, character_id: Optional[str] = None) -> Dict[str, Any]:
-    """Handle simple system macros: /roll, /pp, /ip, /sp, /initiative, /attack, /defend, combat management."""
+    include_text=False skips the pre-rendered "text" of /attack and ability
+    casts for consumers that render from the structured fields.
+    """
     parts = text.strip().split()
     cmd = parts[0].lower()
     if cmd == "/roll":
@@ -1080,7 +1600,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
             pretty_text = f"{parts[1]} → {equation}"
             # Log to combat log so dice rolls appear alongside chat events
             try:
-                await log_if_allowed("dice_roll", {
+                log_if_allowed("dice_roll", lambda: {
                     "event": "dice_roll",
                     "actor": actor,
                     "party_id": party_id,
@@ -1091,7 +1611,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                     "text": pretty_text,
                     "context": context,
                     "encounter_id": encounter_id,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _now_iso()
                 })
             except Exception:
                 # Best-effort logging; ignore failures
@@ -1118,7 +1638,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
         pretty_text = f"{formula} → {equation}"
         # Log stat roll to combat log
         try:
-            await log_if_allowed("stat_roll", {
+            log_if_allowed("stat_roll", lambda: {
                 "event": "stat_roll",
                 "actor": actor,
                 "party_id": party_id,
@@ -1130,7 +1650,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                 "modifier": edge_mod,
                 "context": context,
                 "encounter_id": encounter_id,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now_iso()
             })
         except Exception:
             pass
@@ -1152,16 +1672,15 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
 
         # First try by character_id
         if character_id:
-            char_data = connection_manager.character_cache.get(party_id, {}).get(character_id)
+            char_data = connection_manager.get_character_stats(party_id, character_id)
             char_id = character_id
 
-        # Fallback: search by actor name
+        # Fallback: look up by actor name
         if not char_data:
-            for cid, data in connection_manager.character_cache.get(party_id, {}).items():
-                if data.get("name", "").lower() == actor.lower():
-                    char_data = data
-                    char_id = cid
-                    break
+            name_id, name_data = connection_manager.find_character_by_name(party_id, actor)
+            if name_data:
+                char_data = name_data
+                char_id = name_id
 
         # Get PP and Edge from character data (1d6 + PP + Edge per rules)
         pp_mod = char_data.get("pp", 1) if char_data else 1
@@ -1188,7 +1707,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
 
         # Log initiative to combat log
         try:
-            await log_if_allowed("initiative", {
+            log_if_allowed("initiative", lambda: {
                 "event": "initiative",
                 "actor": actor,
                 "party_id": party_id,
@@ -1199,7 +1718,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                 "modifier": total_mod,
                 "context": context,
                 "encounter_id": encounter_id,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now_iso()
             })
         except Exception:
             pass
@@ -1226,11 +1745,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                 "party_id": party_id
             }
 
-        # Parse mentions using mention_parser
-        from backend.mention_parser import parse_mentions
-        from backend.roll_logic import resolve_multi_die_attack
-
-        db = SessionLocal()
+        db = db_session if db_session is not None else SessionLocal()
         try:
             # Determine if sender is SW for hidden NPC visibility
             sender_is_sw = False
@@ -1264,74 +1779,33 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
             # Get attacker stats from cache - first try by character_id, then by name
             attacker_data = None
             if character_id:
-                attacker_data = connection_manager.character_cache.get(party_id, {}).get(character_id)
+                attacker_data = connection_manager.get_character_stats(party_id, character_id)
 
-            # Fallback: search by name
+            # Fallback: look up by name
             if not attacker_data:
-                for _, data in connection_manager.character_cache.get(party_id, {}).items():
-                    if data.get("name", "").lower() == actor.lower():
-                        attacker_data = data
-                        break
+                _, attacker_data = connection_manager.find_character_by_name(party_id, actor)
 
             # Fallback: load from database if not in cache
             if not attacker_data and character_id:
-                char = db.query(Character).filter(Character.id == character_id).first()
+                char = db.get(Character, character_id)
                 if char:
-                    attacker_data = {
-                        "id": char.id,
-                        "name": char.name,
-                        "type": "character",
-                        "pp": char.pp,
-                        "ip": char.ip,
-                        "sp": char.sp,
-                        "edge": char.edge,
-                        "dp": char.dp,
-                        "max_dp": char.max_dp,
-                        "attack_style": char.attack_style,
-                        "defense_die": char.defense_die
-                    }
+                    attacker_data = _char_to_cache_dict(char, "character")
                     # Cache it for future use
-                    if party_id not in connection_manager.character_cache:
-                        connection_manager.character_cache[party_id] = {}
-                    connection_manager.character_cache[party_id][character_id] = attacker_data
+                    connection_manager.cache_character(party_id, character_id, attacker_data)
 
             # Get target stats from cache or database
-            defender_data = connection_manager.character_cache.get(party_id, {}).get(target_id)
+            defender_data = connection_manager.get_character_stats(party_id, target_id)
 
             if not defender_data:
                 # Try to get from database
                 if target_type == "character":
-                    char = db.query(Character).filter(Character.id == target_id).first()
+                    char = db.get(Character, target_id)
                     if char:
-                        defender_data = {
-                            "id": char.id,
-                            "name": char.name,
-                            "type": "character",
-                            "pp": char.pp,
-                            "ip": char.ip,
-                            "sp": char.sp,
-                            "edge": char.edge,
-                            "dp": char.dp,
-                            "max_dp": char.max_dp,
-                            "attack_style": char.attack_style,
-                            "defense_die": char.defense_die
-                        }
+                        defender_data = _char_to_cache_dict(char, "character")
                 elif target_type == "npc":
-                    npc = db.query(NPC).filter(NPC.id == target_id).first()
+                    npc = db.get(NPC, target_id)
                     if npc:
-                        defender_data = {
-                            "id": npc.id,
-                            "name": npc.name,
-                            "type": "npc",
-                            "pp": npc.pp,
-                            "ip": npc.ip,
-                            "sp": npc.sp,
-                            "edge": npc.edge,
-                            "dp": npc.dp,
-                            "max_dp": npc.max_dp,
-                            "attack_style": npc.attack_style,
-                            "defense_die": npc.defense_die
-                        }
+                        defender_data = _char_to_cache_dict(npc, "npc")
 
             if not attacker_data:
                 return {
@@ -1384,91 +1858,60 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
 
             # Calculate new DP (no floor — can go negative for The Calling)
             new_dp = old_dp - result["total_damage"]
-            defender_edge = defender_data.get("edge", 0)
 
             # Persist DP change to database and check for calling
             knocked_out = False
             calling_triggered = False
 
+            # Write DP without loading the row; status/in_calling are untouched
+            # by this UPDATE, so RETURNING hands back their pre-attack values
+            char = None
             if target_type == "character":
-                char = db.query(Character).filter(Character.id == target_id).first()
+                char = db.execute(
+                    update(Character)
+                    .where(Character.id == target_id)
+                    .values(dp=new_dp)
+                    .returning(
+                        Character.id, Character.status, Character.in_calling, Character.is_npc,
+                        Character.ip, Character.sp, Character.edge, Character.times_called
+                    )
+                    .execution_options(synchronize_session=False)
+                ).first()
                 if char:
-                    char.dp = new_dp
-                    if new_dp <= 0 and char.status == 'active':
-                        char.status = 'unconscious'
-                        knocked_out = True
-                    if new_dp <= -10 and not char.in_calling and not char.is_npc:
-                        char.in_calling = True
-                        calling_triggered = True
+                    knocked_out = new_dp <= 0 and char.status == 'active'
+                    calling_triggered = new_dp <= -10 and not char.in_calling and not char.is_npc
+                    if knocked_out or calling_triggered:
+                        db.execute(
+                            update(Character)
+                            .where(Character.id == target_id)
+                            .values(
+                                status='unconscious' if knocked_out else char.status,
+                                in_calling=calling_triggered or char.in_calling
+                            )
+                            .execution_options(synchronize_session=False)
+                        )
                     db.commit()
             elif target_type == "npc":
-                npc = db.query(NPC).filter(NPC.id == target_id).first()
-                if npc:
-                    npc.dp = new_dp
+                npc_updated = db.execute(
+                    update(NPC)
+                    .where(NPC.id == target_id)
+                    .values(dp=new_dp)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if npc_updated:
                     # NPCs don't have calling, just track unconscious
-                    if new_dp <= 0:
-                        knocked_out = True
+                    knocked_out = new_dp <= 0
                     db.commit()
 
             # Update cache
-            if target_id in connection_manager.character_cache.get(party_id, {}):
-                connection_manager.character_cache[party_id][target_id]["dp"] = new_dp
+            cached_target = connection_manager.get_character_stats(party_id, target_id)
+            if cached_target is not None:
+                cached_target["dp"] = new_dp
                 if knocked_out:
-                    connection_manager.character_cache[party_id][target_id]["status"] = 'unconscious'
-
-            # Build detailed attack breakdown
-            attack_rolls_str = ", ".join([str(r["total"]) for r in result["individual_rolls"]])
-            attack_breakdown = f"{attacker_die} = [{attack_rolls_str}] + PP({attacker_pp}) + Edge({attacker_edge})"
-
-            # Build detailed defense breakdown (for each attack roll)
-            # Unconscious defenders (≤ 0 DP) don't defend
-            defense_breakdowns = []
-            if old_dp <= 0:
-                # Unconscious - no defense roll
-                defense_breakdown = "No defense (unconscious)"
-                for idx, roll_data in enumerate(result["individual_rolls"]):
-                    defense_breakdowns.append(defense_breakdown)
-            else:
-                # Conscious - normal defense rolls
-                for idx, roll_data in enumerate(result["individual_rolls"]):
-                    defense_roll = roll_data.get("defense_roll", 0)
-                    defense_breakdown = f"{defense_die} = [{defense_roll}] + PP({defender_pp}) + Edge({defender_edge})"
-                    defense_breakdowns.append(defense_breakdown)
-
-            # Build outcome text
-            outcome_lines = []
-            outcome_lines.append(f"⚔️ {actor} attacks {target_name}")
-            outcome_lines.append(f"")
-            outcome_lines.append(f"🎲 Attack: {attack_breakdown}")
-
-            # Add individual roll results
-            for idx, roll_data in enumerate(result["individual_rolls"], 1):
-                attack_total = roll_data["total"]
-                defense_total = roll_data["defense_total"]
-                damage = roll_data["damage"]
-                hit = damage > 0
-
-                outcome_lines.append(f"   Roll {idx}: {attack_total} vs {defense_total} → {'HIT' if hit else 'MISS'} ({damage} damage)")
-
-            outcome_lines.append(f"")
-
-            if result["total_damage"] > 0:
-                outcome_lines.append(f"💥 {result['total_damage']} total damage! {target_name} at {new_dp}/{defender_data.get('max_dp', 20)} DP")
-            else:
-                outcome_lines.append(f"🛡️ BLOCKED")
-                outcome_lines.append(f"")
-                outcome_lines.append(f"\"{target_name} blocks all of {actor}'s attacks!\"")
-
-            if knocked_out:
-                outcome_lines.append(f"💀 {target_name} is knocked unconscious!")
-
-            if calling_triggered:
-                outcome_lines.append(f"⚠️ {target_name} has reached -10 DP and enters The Calling!")
-
-            outcome_text = "\n".join(outcome_lines)
+                    cached_target["status"] = 'unconscious'
 
             # Return combat event message for broadcast
-            return {
+            event = {
                 "type": "combat_event",
                 "attacker": actor,
                 "attacker_name": actor,
@@ -1480,7 +1923,6 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                 "total_damage": result["total_damage"],
                 "outcome": result["outcome"],
                 "narrative": result["narrative"],
-                "text": outcome_text,
                 "defender_old_dp": old_dp,
                 "defender_new_dp": new_dp,
                 "defender_max_dp": defender_data.get("max_dp", 20),
@@ -1498,6 +1940,42 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                 "party_id": party_id
             }
 
+            if include_text:
+                # Build outcome text: header, one line per roll, then the result tail
+                if result["total_damage"] > 0:
+                    tail_lines = ["", f"💥 {result['total_damage']} total damage! {target_name} at {new_dp}/{defender_data.get('max_dp', 20)} DP"]
+                else:
+                    tail_lines = ["", "🛡️ BLOCKED", "", f"\"{target_name} blocks all of {actor}'s attacks!\""]
+
+                if knocked_out:
+                    tail_lines.append(f"💀 {target_name} is knocked unconscious!")
+
+                if calling_triggered:
+                    tail_lines.append(f"⚠️ {target_name} has reached -10 DP and enters The Calling!")
+
+                rolls = result["individual_rolls"]
+                if len(rolls) == 1:
+                    r = rolls[0]
+                    event["text"] = _SINGLE_ROLL_FMT % (
+                        actor, target_name, attacker_die, r["total"], attacker_pp, attacker_edge,
+                        r["total"], r["defense_total"], "HIT" if r["damage"] > 0 else "MISS", r["damage"]
+                    ) + "\n" + "\n".join(tail_lines)
+                else:
+                    # Build detailed attack breakdown
+                    attack_rolls_str = ", ".join([str(r["total"]) for r in rolls])
+                    attack_breakdown = f"{attacker_die} = [{attack_rolls_str}] + PP({attacker_pp}) + Edge({attacker_edge})"
+
+                    event["text"] = "\n".join(itertools.chain(
+                        (f"⚔️ {actor} attacks {target_name}", "", f"🎲 Attack: {attack_breakdown}"),
+                        (
+                            _ROLL_LINE_FMT % (idx, r["total"], r["defense_total"], "HIT" if r["damage"] > 0 else "MISS", r["damage"])
+                            for idx, r in enumerate(rolls, 1)
+                        ),
+                        tail_lines
+                    ))
+
+            return event
+
         except Exception as e:
             logger.error(f"Attack macro error: {e}")
             return {
@@ -1507,16 +1985,12 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                 "party_id": party_id
             }
         finally:
-            db.close()
+            _release_session(db, db_session)
 
     if cmd == "/defend":
         # Roll defense die for the character
         # Get character stats from cache if available
-        char_data = None
-        for char_id, data in connection_manager.character_cache.get(party_id, {}).items():
-            if data.get("name", "").lower() == actor.lower():
-                char_data = data
-                break
+        _, char_data = connection_manager.find_character_by_name(party_id, actor)
 
         # Default defense die is 1d6 if not found
         defense_die = "1d6"
@@ -1537,7 +2011,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
 
             # Log defense roll
             try:
-                await log_if_allowed("defend", {
+                log_if_allowed("defend", lambda: {
                     "event": "defend",
                     "actor": actor,
                     "party_id": party_id,
@@ -1548,7 +2022,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                     "text": pretty_text,
                     "context": context,
                     "encounter_id": encounter_id,
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": _now_iso()
                 })
             except Exception:
                 pass
@@ -1568,7 +2042,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
 
     if cmd == "/who":
         # List all available targets (characters and NPCs) in the party with stats
-        db = SessionLocal()
+        db = db_session if db_session is not None else SessionLocal()
         try:
             # Check if sender is SW for visibility
             sender_is_sw = False
@@ -1584,54 +2058,47 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                 char_type = char_data.get('type', 'character')
                 if char_type == 'character':
                     # Format: @Name (DP: X/Y, Weapon: 2d4, Defense: 1d6) 🟢
-                    dp = char_data.get('dp', '?')
-                    max_dp = char_data.get('max_dp', '?')
-                    weapon = char_data.get('attack_style', '1d6')
-                    defense = char_data.get('defense_die', '1d6')
-                    online_characters.append(
-                        f"  @{char_data['name']} (DP: {dp}/{max_dp}, Weapon: {weapon}, Defense: {defense}) 🟢"
-                    )
+                    online_characters.append(_WHO_FMT % (
+                        char_data['name'], char_data.get('dp', '?'), char_data.get('max_dp', '?'),
+                        char_data.get('attack_style', '1d6'), char_data.get('defense_die', '1d6'), "🟢"
+                    ))
+
+            # Party members (may include offline members) and NPCs in one
+            # UNION ALL, fetching only the rendered columns
+            member_ids = connection_manager.get_party_member_ids(party_id, db)
+            members_q = select(
+                Character.id, Character.name, Character.dp, Character.max_dp,
+                Character.attack_style, Character.defense_die, literal("character").label("kind")
+            ).where(Character.id.in_(member_ids))
+            npcs_q = select(
+                NPC.id, NPC.name, NPC.dp, NPC.max_dp,
+                NPC.attack_style, NPC.defense_die, literal("npc").label("kind")
+            ).where(NPC.party_id == party_id)
+            # NPCs are visible only, unless sender is SW
+            if not sender_is_sw:
+                npcs_q = npcs_q.where(NPC.visible_to_players == True)
 
-            # Get party members from database (may include offline members)
-            db_characters = (
-                db.query(Character)
-                .join(PartyMembership, PartyMembership.character_id == Character.id)
-                .filter(PartyMembership.party_id == party_id)
-                .all()
-            )
+            rows = db.execute(union_all(members_q, npcs_q)).all()
 
             offline_characters = []
+            npc_list = []
             online_char_ids = set(cached_chars.keys())
 
-            for char in db_characters:
-                if char.id not in online_char_ids:
-                    # Format with stats for offline players
-                    dp = char.dp if char.dp is not None else '?'
-                    max_dp = char.max_dp if char.max_dp is not None else '?'
-                    weapon = char.attack_style or '1d6'
-                    defense = char.defense_die or '1d6'
-                    offline_characters.append(
-                        f"  @{char.name} (DP: {dp}/{max_dp}, Weapon: {weapon}, Defense: {defense}) ⚫"
-                    )
-
-            # Get NPCs (visible only, unless sender is SW)
-            npc_query = db.query(NPC).filter(NPC.party_id == party_id)
-            if not sender_is_sw:
-                npc_query = npc_query.filter(NPC.visible_to_players == True)
-
-            npcs = npc_query.all()
-            npc_list = []
-            for npc in npcs:
-                dp = npc.dp if npc.dp is not None else '?'
-                max_dp = npc.max_dp if npc.max_dp is not None else '?'
-                weapon = npc.attack_style or '1d6'
-                defense = npc.defense_die or '1d6'
-                # Check if NPC is in cache (active in combat)
-                npc_in_cache = npc.id in cached_chars
-                status = "🔴" if npc_in_cache else "⚪"
-                npc_list.append(
-                    f"  @{npc.name} (DP: {dp}/{max_dp}, Weapon: {weapon}, Defense: {defense}) {status}"
-                )
+            for row_id, name, dp, max_dp, weapon, defense, kind in rows:
+                dp = dp if dp is not None else '?'
+                max_dp = max_dp if max_dp is not None else '?'
+                weapon = weapon or '1d6'
+                defense = defense or '1d6'
+                # Cache keys are string IDs
+                in_cache = str(row_id) in online_char_ids
+                if kind == "character":
+                    if not in_cache:
+                        # Format with stats for offline players
+                        offline_characters.append(_WHO_FMT % (name, dp, max_dp, weapon, defense, "⚫"))
+                else:
+                    # NPC in cache means active in combat
+                    status = "🔴" if in_cache else "⚪"
+                    npc_list.append(_WHO_FMT % (name, dp, max_dp, weapon, defense, status))
 
             # Format response
             lines = ["📋 **Available Targets:**"]
@@ -1669,7 +2136,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                 "party_id": party_id
             }
         finally:
-            db.close()
+            _release_session(db, db_session)
 
     if cmd == "/start-combat":
         # SW-only: Start a combat encounter
@@ -1741,23 +2208,23 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                 "party_id": party_id
             }
 
-        db = SessionLocal()
+        db = db_session if db_session is not None else SessionLocal()
         try:
-            # Get all characters in this party via PartyMembership
-            party_members = db.query(Character).join(
-                PartyMembership, PartyMembership.character_id == Character.id
-            ).filter(PartyMembership.party_id == party_id).all()
-
+            # Reset every party member's uses in one server-side UPDATE
+            member_ids = connection_manager.get_party_member_ids(party_id, db)
             reset_count = 0
-            for char in party_members:
-                char.current_uses = char.max_uses_per_encounter
-                reset_count += 1
+            if member_ids:
+                reset_count = db.execute(
+                    update(Character)
+                    .where(Character.id.in_(member_ids))
+                    .values(current_uses=Character.max_uses_per_encounter)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
 
             db.commit()
 
             # Also end any active combat encounter
-            if connection_manager.get_encounter(party_id):
-                connection_manager.end_encounter(party_id)
+            connection_manager.end_encounter(party_id)
 
             return {
                 "type": "system",
@@ -1776,7 +2243,7 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                 "party_id": party_id
             }
         finally:
-            db.close()
+            _release_session(db, db_session)
 
     if cmd == "/turn-order":
         # Display current turn order
@@ -1789,10 +2256,9 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
                 "party_id": party_id
             }
 
-        # Sort initiative if not already sorted
+        # Sort initiative if not already sorted (sorts this encounter in place)
         if not encounter.get('turn_order'):
             connection_manager.sort_initiative(party_id)
-            encounter = connection_manager.get_encounter(party_id)
 
         turn_order = encounter.get('turn_order', [])
         if not turn_order:
@@ -1871,11 +2337,8 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
         old_round = encounter.get('turn_number', 1)
 
         # Advance turn
-        connection_manager.next_turn(party_id)
-        encounter = connection_manager.get_encounter(party_id)
-
-        current_combatant = connection_manager.get_current_turn(party_id)
-        turn_num = encounter.get('turn_number', 1)
+        encounter, current_combatant = connection_manager.next_turn(party_id)
+        turn_num = encounter['turn_number']
 
         if current_combatant:
             # Check if we wrapped to a new round
@@ -2031,7 +2494,9 @@ async def handle_macro(party_id: str, actor: str, text: str, context: Optional[s
         macro_command=cmd,
         target_args=target_args,
         character_id=character_id,
-        context=context
+        context=context,
+        include_text=include_text,
+        db_session=db_session
     )
     if ability_result is not None:
         return ability_result
@@ -2069,7 +2534,9 @@ async def party_connections(party_id: str):
 async def get_party_messages(
     party_id: str,
     limit: int = Query(50, description="Maximum number of messages to return"),
-    offset: int = Query(0, description="Number of messages to skip")
+    offset: int = Query(0, description="Number of messages to skip"),
+    before: Optional[datetime] = Query(None, description="Only return messages created before this timestamp"),
+    before_id: Optional[UUID] = Query(None, description="Message id paired with 'before' to break created_at ties")
 ):
     """
     Get message history for a party.
@@ -2080,24 +2547,36 @@ async def get_party_messages(
     Query Parameters:
         limit: Maximum number of messages to return (default: 50)
         offset: Number of messages to skip for pagination (default: 0)
+        before: Cursor from a previous page's next_before; takes precedence over offset
+        before_id: Cursor from a previous page's next_before_id, sent together with before
     """
     db = SessionLocal()
     try:
         # Fetch messages for this party
-        messages = db.query(Message)\
+        query = db.query(Message)\
             .filter(Message.party_id == party_id)\
-            .order_by(Message.created_at.desc())\
-            .offset(offset)\
-            .limit(limit)\
-            .all()
+            .order_by(Message.created_at.desc(), Message.id.desc())
+
+        # Keyset pagination walks the (party_id, created_at, id) index instead of skipping
+        # rows; the id tie-break keeps messages sharing a created_at from being skipped
+        if before is not None and before_id is not None:
+            query = query.filter(tuple_(Message.created_at, Message.id) < tuple_(before, before_id))
+        elif before is not None:
+            query = query.filter(Message.created_at < before)
+        elif offset:
+            query = query.offset(offset)
+
+        messages = query.limit(limit).all()
 
         # Reverse to get oldest-first ordering
         messages = list(reversed(messages))
 
-        # Format for frontend
-        return {
+        # Format for frontend (orjson encodes the UUID ids directly)
+        return ORJSONResponse({
             "party_id": party_id,
             "count": len(messages),
+            "next_before": messages[0].created_at.isoformat() if messages else None,
+            "next_before_id": messages[0].id if messages else None,
             "messages": [
                 {
                     "id": msg.id,
@@ -2111,7 +2590,7 @@ async def get_party_messages(
                 }
                 for msg in messages
             ]
-        }
+        })
     except Exception as e:
         logger.error(f"Failed to fetch message history: {e}")
         return {"party_id": party_id, "count": 0, "messages": [], "error": str(e)}
@@ -2119,12 +2598,83 @@ async def get_party_messages(
         db.close()
 
 
-async def log_combat_event(entry: Dict[str, Any]):
-    try:
-        async with httpx.AsyncClient() as client:
-            await client.post(COMBAT_LOG_URL, json=entry)
-    except Exception as e:
-        logger.warning(f"Combat log failed: {e}")
+@chat_blp.get("/chat/party/{party_id}/combat-history")
+async def get_party_combat_history(
+    party_id: str,
+    limit: int = Query(50, description="Maximum number of turns to return"),
+    before: Optional[datetime] = Query(None, description="Only return turns recorded before this timestamp")
+):
+    """
+    Get combat turn history for a party, newest first.
+
+    Query Parameters:
+        limit: Maximum number of turns to return (default: 50)
+        before: Cursor from a previous page's next_before
+    """
+    turns = get_combat_history(party_id, limit=limit, before=before)
+    return {
+        "party_id": party_id,
+        "count": len(turns),
+        "next_before": turns[-1]["timestamp"] if turns else None,
+        "turns": turns
+    }
+
+
+# Combat log entries are posted by one background worker so macro replies
+# never wait on the log endpoint
+_log_queue: Optional[asyncio.Queue] = None
+_log_worker_task: Optional[asyncio.Task] = None
+
+
+_LOG_HEADERS = {"Content-Type": "application/json", "X-API-Key": API_KEY}
+
+
+async def _log_worker(queue: asyncio.Queue):
+    """Post queued combat log entries in ordered batches over a single reusable client."""
+    async with httpx.AsyncClient() as client:
+        while True:
+            batch = await _drain_batch(queue, WS_LOG_BATCH_MAX, WS_LOG_BATCH_WINDOW)
+            try:
+                # Top-level None fields are omitted: the log schema defaults them to None
+                body = orjson.dumps(
+                    [{k: v for k, v in entry.items() if v is not None} for entry in batch],
+                    option=orjson.OPT_NON_STR_KEYS
+                )
+                resp = await client.post(COMBAT_LOG_BULK_URL, content=body, headers=_LOG_HEADERS)
+                resp.raise_for_status()
+                # The bulk endpoint skips malformed entries and records the rest
+                rejected = orjson.loads(resp.content).get("rejected")
+                if rejected:
+                    logger.warning("Combat log rejected %d of %d entries", rejected, len(batch))
+            except Exception as e:
+                logger.warning(f"Combat log failed ({len(batch)} entries): {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+
+def log_combat_event(entry: Dict[str, Any]):
+    """Queue a combat log entry, dropping the oldest one when the queue is full."""
+    global _log_queue, _log_worker_task
+    loop = asyncio.get_running_loop()
+    if _log_worker_task is None or _log_worker_task.done() or _log_worker_task.get_loop() is not loop:
+        _log_queue = asyncio.Queue(maxsize=WS_LOG_QUEUE_MAX)
+        _log_worker_task = loop.create_task(_log_worker(_log_queue))
+    if _log_queue.full():
+        _log_queue.get_nowait()
+        _log_queue.task_done()
+    # The log endpoint requires a timestamp; stamp entries that arrive without one
+    if entry.get("timestamp") is None:
+        entry["timestamp"] = _now_iso()
+    _log_queue.put_nowait(entry)
+
+
+async def close_combat_log(timeout: float = 5.0):
+    """Flush pending combat log entries and stop the worker (app shutdown)."""
+    global _log_queue, _log_worker_task
+    task, queue = _log_worker_task, _log_queue
+    _log_worker_task = _log_queue = None
+    await _stop_worker(task, queue, timeout, "combat log entries")
 
 actor_roll_modes = {
     "Kai": "manual",
@@ -2133,9 +2683,21 @@ actor_roll_modes = {
     "Bill": "prompt"
 }
 
+@functools.lru_cache(maxsize=1)
+def _chat_template():
+    """Load chat.html once; later renders skip the loader's lookup and mtime check."""
+    return templates.get_template("chat.html")
+
+
+async def _render_chat(request: Request, response: Optional[Dict[str, Any]]) -> HTMLResponse:
+    """Render the chat page on a worker thread so a render never stalls the event loop."""
+    body = await asyncio.to_thread(_chat_template().render, {"request": request, "response": response})
+    return HTMLResponse(body)
+
+
 @chat_blp.get("/chat", response_class=HTMLResponse)
 async def chat_get(request: Request):
-    return templates.TemplateResponse("chat.html", {"request": request, "response": None})
+    return await _render_chat(request, None)
 
 
 @chat_blp.websocket("/chat/party/{party_id}")
@@ -2166,24 +2728,21 @@ async def chat_party_ws(
     await websocket.accept()
 
     # Add connection with character caching
-    await connection_manager.add_connection(party_id, websocket, character_id)
-
-    # Get connection metadata
-    metadata = connection_manager.get_connection_metadata(party_id, websocket)
-    role = metadata.get("role", "player") if metadata else "player"
-    character_name = metadata.get("character_name", "Unknown") if metadata else "Unknown"
+    metadata = await connection_manager.add_connection(party_id, websocket, character_id)
+    role = metadata.get("role", "player")
+    character_name = metadata.get("character_name", "Unknown")
 
     # Send welcome message to the connecting client with their character info
     # This allows the frontend to update the Actor field with the correct name
     if character_id:
         try:
-            await websocket.send_json({
+            await websocket.send_text(_ws_json({
                 "type": "welcome",
                 "character_id": character_id,
                 "character_name": character_name,
                 "role": role,
                 "party_id": party_id
-            })
+            }))
         except Exception:
             pass
 
@@ -2196,12 +2755,15 @@ async def chat_party_ws(
             "party_id": party_id
         })
 
+    # One session for this connection's macros, opened once registration has
+    # succeeded and closed by the finally below
+    ws_db = SessionLocal()
     try:
         while True:
             data = await websocket.receive_text()
             try:
-                payload = json.loads(data)
-            except json.JSONDecodeError:
+                payload = orjson.loads(data)
+            except orjson.JSONDecodeError:
                 payload = {"type": "message", "actor": "unknown", "text": data}
 
             actor = payload.get("actor", character_name if character_id else "unknown")
@@ -2211,47 +2773,62 @@ async def chat_party_ws(
             chat_mode = payload.get("chat_mode")  # ic, ooc, or whisper
             whisper_targets = payload.get("whisper_targets", [])  # List of target names
 
+            # Party-wide backpressure so one busy party can't saturate the loop or DB writer
+            if WS_PARTY_MSG_LIMIT > 0:
+                window = connection_manager.party_windows.get(party_id)
+                if window is None:
+                    window = connection_manager.party_windows[party_id] = PartyWindow()
+                if not window.allow(monotonic(), WS_PARTY_MSG_LIMIT):
+                    try:
+                        await websocket.send_text(_ws_json({
+                            "type": "system",
+                            "actor": "system",
+                            "text": "Party is busy. Please slow down.",
+                            "party_id": party_id
+                        }))
+                    except Exception:
+                        pass
+                    continue
+
             if isinstance(text, str) and text.startswith("/"):
-                # Simple macro throttle per actor in party to prevent spam
-                key = f"{party_id}:{actor}"
+                # Token-bucket macro throttle per actor in party to prevent spam:
+                # one token per WS_MACRO_THROTTLE_MS, up to WS_MACRO_BURST saved
                 now = monotonic()
-                last = macro_last_ts.get(key, 0.0)
-                threshold = WS_MACRO_THROTTLE_MS / 1000.0
-                if now - last < threshold:
-                    remaining = max(0.0, threshold - (now - last))
+                _sweep_macro_buckets(now)
+                bucket = macro_buckets.get((party_id, actor))
+                if bucket is None:
+                    bucket = macro_buckets[(party_id, actor)] = TokenBucket(WS_MACRO_BURST, now)
+                rate = 1000.0 / WS_MACRO_THROTTLE_MS if WS_MACRO_THROTTLE_MS > 0 else None
+                if rate is not None and not bucket.acquire(now, rate, WS_MACRO_BURST):
+                    remaining = (1 - bucket.tokens) / rate
                     try:
-                        await websocket.send_json({
+                        await websocket.send_text(_ws_json({
                             "type": "system",
                             "actor": "system",
                             "text": f"Rate-limited. Try again in {remaining:.2f}s",
                             "party_id": party_id
-                        })
+                        }))
                     except Exception:
                         pass
                     continue
-                macro_last_ts[key] = now
-                msg = await handle_macro(party_id, actor, text, ctx, enc_id, character_id)
+                msg = await handle_macro(party_id, actor, text, ctx, enc_id, character_id, db_session=ws_db)
 
                 # Check if this is an error/unknown command or help text - send only to sender
                 is_private_message = (
                     msg.get("type") == "system" and
                     msg.get("actor") == "system" and
-                    any(phrase in msg.get("text", "").lower() for phrase in [
-                        "unknown command", "usage:", "not found", "error", "failed", "invalid",
-                        "only the story weaver", "cannot verify", "has no ability uses",
-                        "available commands", "📜"  # Help text markers
-                    ])
+                    _PRIVATE_REPLY_RE.search(msg.get("text", "")) is not None
                 )
 
                 if is_private_message:
                     # Send private messages (errors, help text) only to the sender
                     try:
-                        await websocket.send_json(msg)
+                        await websocket.send_text(_ws_json(msg))
                     except Exception:
                         pass
                 else:
                     # Regular broadcast for valid macro results
-                    await broadcast(party_id, msg)
+                    await connection_manager.broadcast_text(party_id, _ws_json(msg))
             elif chat_mode == "whisper" and whisper_targets:
                 # Private whisper - only send to targets and SW
                 msg = {
@@ -2265,10 +2842,10 @@ async def chat_party_ws(
                 await connection_manager.broadcast_whisper(
                     party_id, msg, whisper_targets, actor
                 )
-                logger.info(f"Whisper from {actor} to {whisper_targets}: {text[:50]}...")
+                logger.info("Whisper from %s to %s: %s...", actor, whisper_targets, text[:50])
 
                 # Save whisper to database
-                save_message_to_db(
+                queue_message_for_db(
                     party_id=party_id,
                     character_id=character_id,
                     character_name=actor,
@@ -2279,24 +2856,22 @@ async def chat_party_ws(
             else:
                 # Regular message or IC/OOC (broadcast to all)
                 # Determine message type based on chat_mode for proper tab routing
-                if chat_mode == 'ooc':
-                    message_type = 'chat_ooc'
-                elif chat_mode == 'ic':
-                    message_type = 'chat_ic'
-                else:
-                    message_type = payload.get("type", "message")
+                # (isinstance guard: chat_mode is client JSON and may be unhashable)
+                message_type = (
+                    isinstance(chat_mode, str) and _MODE_TO_TYPE.get(chat_mode)
+                ) or payload.get("type", "message")
 
-                msg = {
+                # Encoded straight away; the frame dict is dropped before fan-out
+                await connection_manager.broadcast_text(party_id, _ws_json({
                     "type": message_type,
                     "actor": actor,
                     "text": text,
                     "party_id": party_id,
-                    "chat_mode": chat_mode if chat_mode else None
-                }
-                await broadcast(party_id, msg)
+                    "chat_mode": chat_mode or None
+                }))
 
                 # Save regular message to database
-                save_message_to_db(
+                queue_message_for_db(
                     party_id=party_id,
                     character_id=character_id,
                     character_name=actor,
@@ -2330,12 +2905,14 @@ async def chat_party_ws(
             })
         except Exception:
             pass
+    finally:
+        ws_db.close()
 
 
 @chat_blp.post("/chat", response_class=HTMLResponse)
 async def chat_post(request: Request, payload: str = Form(...)):
     try:
-        data = json.loads(payload)
+        data = orjson.loads(payload)
         result = resolve_spellcast(
             caster=data["caster"],
             target=data["target"],
@@ -2356,7 +2933,7 @@ async def chat_post(request: Request, payload: str = Form(...)):
             "log": []
         }
 
-    return templates.TemplateResponse("chat.html", {"request": request, "response": response})
+    return await _render_chat(request, response)
 
 @chat_blp.post("/chat/api", response_model=Dict[str, Any])
 async def chat_api(data: ChatMessageSchema = Body(...)):
@@ -2435,14 +3012,14 @@ async def chat_api(data: ChatMessageSchema = Body(...)):
             "details": result
         })
 
-    await log_combat_event({
+    log_combat_event({
     "actor": data.actor,
     "timestamp": data.timestamp,
     "context": data.context,
     "encounter_id": data.context,
     "triggered_by": data.triggered_by or data.actor,
     "narration": response.get("narration"),
-    "action": data.action.dict() if data.action else None,
+    "action": data.action.model_dump() if data.action else None,
     "roll": data.roll,
     "tethers": data.tethers,
     "log": response.get("log")
@@ -2450,37 +3027,48 @@ async def chat_api(data: ChatMessageSchema = Body(...)):
 
     return response
 
+# Example chat payload; constant, so it is encoded once at import
+_CHAT_SCHEMA_BYTES = orjson.dumps({
+    "actor": "Kai",
+    "triggered_by": "Story Weaver",
+    "message": "Kai casts Ember Veil!",
+    "context": "Volcanic battlefield",
+    "action": {
+        "name": "Ember Veil",
+        "type": "spell",
+        "target": "aoe",
+        "traits": {"IP": 3, "Edge": 2},
+        "tags": ["fire", "protective"],
+        "description": "A veil of flame shields allies and scorches nearby foes."
+    },
+    "tethers": ["Protect the innocent"],
+    "roll": {
+        "die": "1d10",
+        "modifiers": {"IP": 3, "Edge": 2},
+        "result": 9
+    },
+    "timestamp": "2025-11-07T11:30:00"
+})
+
 @chat_blp.get("/chat/schema", response_model=Dict[str, Any])
 async def chat_schema():
-    return {
-        "actor": "Kai",
-        "triggered_by": "Story Weaver",
-        "message": "Kai casts Ember Veil!",
-        "context": "Volcanic battlefield",
-        "action": {
-            "name": "Ember Veil",
-            "type": "spell",
-            "target": "aoe",
-            "traits": {"IP": 3, "Edge": 2},
-            "tags": ["fire", "protective"],
-            "description": "A veil of flame shields allies and scorches nearby foes."
-        },
-        "tethers": ["Protect the innocent"],
-        "roll": {
-            "die": "1d10",
-            "modifiers": {"IP": 3, "Edge": 2},
-            "result": 9
-        },
-        "timestamp": "2025-11-07T11:30:00"
-    }
+    return Response(content=_CHAT_SCHEMA_BYTES, media_type="application/json")
+
+@functools.lru_cache(maxsize=64)
+def _parse_simple_die(die: str) -> tuple[int, int]:
+    """Split a die string like '1d10' into (count, sides); callers use a small fixed set."""
+    num, sides = map(int, die.lower().split("d"))
+    return num, sides
+
 
 def simulate_roll(die: str, modifiers: Dict[str, int]) -> Dict[str, Any]:
     """
     Simulates a roll like '1d10' and adds modifiers.
     Returns the breakdown and total.
     """
-    num, sides = map(int, die.lower().split("d"))
-    rolls = [random.randint(1, sides) for _ in range(num)]
+    num, sides = _parse_simple_die(die)
+    randint = random.randint
+    rolls = [randint(1, sides) for _ in range(num)]
     mod_total = sum(modifiers.values())
     total = sum(rolls) + mod_total
 
@@ -2497,7 +3085,7 @@ async def resolve_roll(data: ResolveRollSchema = Body(...)):
     # Stubbed logic — later compare against incoming threat
     outcome = "success" if data.result >= 10 else "failure"
 
-    await log_combat_event({
+    log_combat_event({
         "actor": data.actor,
         "timestamp": getattr(data, "timestamp", "unknown"),
         "context": data.context,
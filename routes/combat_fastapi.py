@@ -4,8 +4,9 @@ FastAPI router with async handlers, request_id preservation, multi-die combat re
 """
 
 from fastapi import APIRouter, Body, Request, HTTPException
+from fastapi.responses import Response
 from typing import Dict, Any, List
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from routes.schemas.combat import (
     CombatReplayRequest,
     CombatEchoRequest,
@@ -22,6 +23,7 @@ from routes.schemas.combat import (
 from backend.roll_logic import resolve_multi_die_attack, roll_die
 from routes.chat import broadcast_combat_event
 import logging
+import orjson
 import random
 import re
 from schemas.loader import CORE_RULESET
@@ -34,6 +36,10 @@ router = APIRouter(prefix="/api/combat", tags=["Combat"])
 # Temporary in-memory store for combat logs
 combat_log_store: List[Dict[str, Any]] = []
 
+# Encoded /log/recent body and the store length it was built at; the store is
+# append-only, so its length versions it
+_recent_logs_cache: tuple[int, bytes] = (-1, b"")
+
 # Pydantic schema for a combat log entry
 class CombatLogEntry(BaseModel):
     actor: str
@@ -57,12 +63,35 @@ async def post_combat_log(entry: CombatLogEntry = Body(...)):
         "total_entries": len(combat_log_store)
     }
 
+# POST endpoint to record a batch of combat log entries in order
+@router.post("/log/bulk", response_model=Dict[str, Any])
+async def post_combat_log_bulk(entries: List[Dict[str, Any]] = Body(...)):
+    # Validate entries one at a time so a malformed entry is skipped, not the whole batch
+    recorded, rejected = [], 0
+    for raw in entries:
+        try:
+            recorded.append(CombatLogEntry.model_validate(raw).model_dump())
+        except ValidationError as e:
+            rejected += 1
+            logger.warning("Skipping invalid combat log entry: %s", e)
+    combat_log_store.extend(recorded)
+    return {
+        "message": f"{len(recorded)} combat log entries recorded",
+        "rejected": rejected,
+        "total_entries": len(combat_log_store)
+    }
+
 # GET endpoint to retrieve the most recent combat logs
 @router.get("/log/recent", response_model=Dict[str, Any])
 async def get_recent_combat_logs():
-    return {
-        "entries": combat_log_store[-10:]
-    }
+    global _recent_logs_cache
+    version, body = _recent_logs_cache
+    if version != len(combat_log_store):
+        body = orjson.dumps({
+            "entries": combat_log_store[-10:]
+        })
+        _recent_logs_cache = (len(combat_log_store), body)
+    return Response(content=body, media_type="application/json")
 
 @router.post("/replay", response_model=Dict[str, Any])
 async def replay_combat(data: CombatReplayRequest = Body(...)):
@@ -1,5 +1,4 @@
 import datetime
-from flask import jsonify
 from routes.schemas.blp import schemas_blp
 
 @schemas_blp.route("/playground/<schema_name>", methods=["GET"])
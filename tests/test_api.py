@@ -324,6 +324,93 @@ def test_combat_log_recent(test_client):
     assert any(e.get("actor") == "Recorder" for e in recent_body.get("entries", []))
 
 
+def test_combat_log_bulk(test_client):
+    """Post a batch of combat log entries and retrieve them in order via /log/recent."""
+    headers = {"X-API-Key": os.environ.get("API_KEY", "devkey")}
+    entries = [
+        {"actor": "Batcher", "timestamp": f"2025-12-07T12:00:0{i}", "context": "enc-bulk", "outcome": str(i)}
+        for i in range(3)
+    ]
+
+    post_resp = test_client.post("/api/combat/log/bulk", headers=headers, json=entries)
+    assert post_resp.status_code == 200
+
+    recent_resp = test_client.get("/api/combat/log/recent", headers=headers)
+    assert recent_resp.status_code == 200
+    recent = [e for e in recent_resp.json().get("entries", []) if e.get("actor") == "Batcher"]
+    assert [e.get("outcome") for e in recent] == ["0", "1", "2"]
+
+
+def test_combat_log_worker_posts_through_api_key_check(test_client, monkeypatch):
+    """The chat log worker's bulk POST passes the /api/ key middleware and is recorded."""
+    import asyncio
+    import httpx
+    from backend.app import application
+    from routes import chat
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        chat.httpx, "AsyncClient",
+        lambda *a, **k: real_client(transport=httpx.ASGITransport(app=application))
+    )
+    monkeypatch.setattr(chat, "COMBAT_LOG_BULK_URL", "http://testserver/api/combat/log/bulk")
+
+    async def post_entries():
+        chat.log_combat_event({"actor": "WorkerPosted", "timestamp": "2025-12-07T12:00:00"})
+        await chat.close_combat_log()
+
+    asyncio.run(post_entries())
+
+    headers = {"X-API-Key": os.environ.get("API_KEY", "devkey")}
+    recent_resp = test_client.get("/api/combat/log/recent", headers=headers)
+    assert any(e.get("actor") == "WorkerPosted" for e in recent_resp.json().get("entries", []))
+
+
+def test_combat_log_worker_batch_keeps_valid_entries(test_client, monkeypatch, caplog):
+    """A worker batch with a malformed entry still records the valid ones and logs the rejection."""
+    import asyncio
+    import httpx
+    from backend.app import application
+    from routes import chat
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        chat.httpx, "AsyncClient",
+        lambda *a, **k: real_client(transport=httpx.ASGITransport(app=application))
+    )
+    monkeypatch.setattr(chat, "COMBAT_LOG_BULK_URL", "http://testserver/api/combat/log/bulk")
+
+    async def post_entries():
+        chat.log_combat_event({"actor": "WorkerKept"})  # stamped with a timestamp on queueing
+        chat.log_combat_event({"narration": "no actor"})
+        await chat.close_combat_log()
+
+    asyncio.run(post_entries())
+
+    headers = {"X-API-Key": os.environ.get("API_KEY", "devkey")}
+    recent_resp = test_client.get("/api/combat/log/recent", headers=headers)
+    assert any(e.get("actor") == "WorkerKept" for e in recent_resp.json().get("entries", []))
+    assert "rejected 1 of 2 entries" in caplog.text
+
+
+def test_combat_log_bulk_skips_invalid_entries(test_client):
+    """A malformed entry in a bulk post is rejected on its own; the rest are still recorded."""
+    headers = {"X-API-Key": os.environ.get("API_KEY", "devkey")}
+    entries = [
+        {"actor": "BulkGood", "timestamp": "2025-12-07T12:00:00"},
+        {"actor": "BulkBad"},
+    ]
+
+    post_resp = test_client.post("/api/combat/log/bulk", headers=headers, json=entries)
+    assert post_resp.status_code == 200
+    assert post_resp.json().get("rejected") == 1
+
+    recent_resp = test_client.get("/api/combat/log/recent", headers=headers)
+    actors = [e.get("actor") for e in recent_resp.json().get("entries", [])]
+    assert "BulkGood" in actors
+    assert "BulkBad" not in actors
+
+
 def test_combat_attack_by_id_persists_dp(test_client):
     """Attack using character IDs auto-persists DP changes to database."""
     headers = {"X-API-Key": os.environ.get("API_KEY", "devkey")}